@@ -3,11 +3,25 @@ from typing import Optional
 
 class Settings(BaseSettings):
     gemini_api_key: Optional[str] = None
+    gemini_model: str = "gemini-pro-latest"
     redis_url: str = "redis://localhost:6379"
+    redis_max_connections: int = 50
     mongo_url: str = "mongodb://localhost:27017"
     otlp_endpoint: Optional[str] = None
     log_level: str = "INFO"
     database_name: str = "agent_system"
+    llm_max_workers: int = 32
+    # Seconds a streamed Gemini response may go without a new chunk before it is abandoned
+    llm_chunk_timeout: float = 60.0
+    # Workers share task and session state through Redis; without it each falls back to its own memory
+    workers: int = 1
+    max_history_entries: int = 1000
+    # Send research tasks to the ARQ worker (src/workers/research_worker.py) instead of running them in the API process
+    task_queue_enabled: bool = False
+    max_concurrent_tasks: int = 8
+    max_pending_tasks: int = 100
+    # Demo mode: tools sleep to imitate the latency of the real APIs they stand in for
+    simulate_latency: bool = False
     
     class Config:
         env_file = ".env"
@@ -3,9 +3,12 @@ import json
 
 BASE_URL = "http://localhost:8000"
 
+# One session for every call so keep-alive reuses the same connection
+session = requests.Session()
+
 def test_endpoint(endpoint):
     try:
-        response = requests.get(f"{BASE_URL}{endpoint}")
+        response = session.get(f"{BASE_URL}{endpoint}")
         print(f" {endpoint}: Status {response.status_code}")
         return response.json()
     except Exception as e:
@@ -36,13 +39,13 @@ try:
         "tone": "professional",
         "length": "medium"
     }
-    response = requests.post(f"{BASE_URL}/research", json=research_data)
+    response = session.post(f"{BASE_URL}/research", json=research_data)
     if response.status_code == 200:
         task_info = response.json()
         print(f" Research task created: {task_info['task_id']}")
         
-        # Check the task status
-        task_status = test_endpoint(f"/tasks/{task_info['task_id']}")
+        # Wait for the task to finish with one long-poll instead of repeated checks
+        task_status = test_endpoint(f"/tasks/{task_info['task_id']}/wait?timeout=30")
         if task_status:
             print(f"   Task Status: {task_status['status']}")
     else:
@@ -11,8 +11,9 @@ import os
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.api.routes import app
 from src.observability.logging import get_logger
+from src.observability.metrics import prepare_multiprocess_dir
+from config.settings import settings
 
 logger = get_logger(__name__)
 
@@ -56,14 +57,20 @@ def main():
     print(" Starting server... (Press Ctrl+C to stop)")
     
     try:
-        # Start the server - FIXED: Use the app directly instead of string
+        prepare_multiprocess_dir()
+        
+        # The import string is required when uvicorn spawns more than one worker;
+        # "auto" picks uvloop and httptools whenever they are installed
         uvicorn.run(
-            app,  # Pass the app object directly
+            "src.api.routes:app",
             host="0.0.0.0",
             port=8000,
             reload=False,
-            log_level="info",
-            access_log=True
+            workers=settings.workers,
+            loop="auto",
+            http="auto",
+            log_level="warning",
+            access_log=False
         )
     except KeyboardInterrupt:
         print("\n Server stopped by user")
@@ -1,13 +1,20 @@
 import asyncio
+import hashlib
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 from src.models.schemas import AgentType, AgentMessage
 from src.memory.memory_bank import MemoryBank
 from src.observability.logging import get_logger
 from src.observability.tracing import tracer
+from src.llm import gemini_client
 
 logger = get_logger(__name__)
 
+# Seconds an LLM response stays reusable for an identical prompt
+_LLM_CACHE_TTL = 300
+_LLM_CACHE_MAX_ENTRIES = 256
+
 class BaseAgent(ABC):
     def __init__(self, agent_type: AgentType, name: str):
         self.agent_type = agent_type
@@ -15,6 +22,9 @@ class BaseAgent(ABC):
         self.memory_bank = MemoryBank()
         self.logger = get_logger(f"agent.{name}")
         self.is_running = False
+        self.model = None
+        self._llm_cache: Dict[str, Tuple[float, str]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
         
     @abstractmethod
     async def process_message(self, message: AgentMessage) -> Dict[str, Any]:
@@ -25,7 +35,8 @@ class BaseAgent(ABC):
         pass
     
     async def send_message(self, receiver: AgentType, content: Dict[str, Any], message_type: str):
-        message = AgentMessage(
+        # Built from agent-internal values, so construct without validating
+        message = AgentMessage.model_construct(
             sender=self.agent_type,
             receiver=receiver,
             content=content,
@@ -34,10 +45,112 @@ class BaseAgent(ABC):
         self.logger.info(f"Sending message to {receiver}", message_type=message_type)
         return message
     
+    async def _call_llm(self, prompt: Union[str, List[str]]) -> str:
+        key = self._prompt_key(prompt)
+        now = time.monotonic()
+        
+        cached = self._llm_cache.get(key)
+        if cached and now - cached[0] < _LLM_CACHE_TTL:
+            self.logger.debug("LLM cache hit", prompt_hash=key[:12])
+            return cached[1]
+        
+        # Concurrent callers with the same prompt share one upstream request. It runs as
+        # its own task, so a cancelled caller (e.g. a dropped client) doesn't fail the rest
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.get_running_loop().create_task(self._fetch_llm_response(key, prompt, now))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda task: self._finish_inflight(key, task))
+        return await asyncio.shield(inflight)
+    
+    async def _fetch_llm_response(self, key: str, prompt: Union[str, List[str]], now: float) -> str:
+        text = await self._get_shared_llm_response(key)
+        if text is None:
+            text = "".join([chunk async for chunk in gemini_client.stream(prompt, self.model)])
+            await self._set_shared_llm_response(key, text)
+        
+        self._cache_llm_response(key, now, text)
+        return text
+    
+    def _finish_inflight(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark a failure retrieved so it is not reported when every caller had already left
+        if not task.cancelled():
+            task.exception()
+    
+    async def _stream_llm(self, prompt: Union[str, List[str]]) -> AsyncIterator[str]:
+        key = self._prompt_key(prompt)
+        now = time.monotonic()
+        
+        cached = self._llm_cache.get(key)
+        if cached and now - cached[0] < _LLM_CACHE_TTL:
+            yield cached[1]
+            return
+        
+        shared = await self._get_shared_llm_response(key)
+        if shared is not None:
+            self._cache_llm_response(key, now, shared)
+            yield shared
+            return
+        
+        chunks = []
+        async for chunk in gemini_client.stream(prompt, self.model):
+            chunks.append(chunk)
+            yield chunk
+        text = "".join(chunks)
+        self._cache_llm_response(key, now, text)
+        await self._set_shared_llm_response(key, text)
+    
+    def _cache_llm_response(self, key: str, now: float, text: str):
+        if len(self._llm_cache) >= _LLM_CACHE_MAX_ENTRIES:
+            self._evict_llm_cache(now)
+        self._llm_cache[key] = (now, text)
+    
+    async def _get_shared_llm_response(self, key: str) -> Optional[str]:
+        # Redis lets every worker process reuse a response; it is optional,
+        # so any failure just means asking the model
+        if not self.memory_bank.redis_client:
+            return None
+        try:
+            cached = await self.memory_bank.redis_client.get(f"llm:{key}")
+            return cached.decode() if cached is not None else None
+        except Exception as e:
+            self.logger.warning(f"Shared LLM cache lookup failed: {str(e)}")
+            return None
+    
+    async def _set_shared_llm_response(self, key: str, text: str):
+        if not self.memory_bank.redis_client:
+            return
+        try:
+            await self.memory_bank.redis_client.setex(f"llm:{key}", _LLM_CACHE_TTL, text)
+        except Exception as e:
+            self.logger.warning(f"Shared LLM cache write failed: {str(e)}")
+    
+    @staticmethod
+    def _prompt_key(prompt: Union[str, List[str]]) -> str:
+        # Hash multi-part prompts part by part rather than joining them first
+        digest = hashlib.sha256()
+        for part in [prompt] if isinstance(prompt, str) else prompt:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def _evict_llm_cache(self, now: float):
+        expired = [key for key, (stored_at, _) in self._llm_cache.items() if now - stored_at >= _LLM_CACHE_TTL]
+        for key in expired:
+            del self._llm_cache[key]
+        
+        # Still full: drop the oldest entry (dicts keep insertion order)
+        if len(self._llm_cache) >= _LLM_CACHE_MAX_ENTRIES:
+            del self._llm_cache[next(iter(self._llm_cache))]
+    
     async def start(self):
+        await self.memory_bank.initialize()
         self.is_running = True
         self.logger.info(f"Agent {self.name} started")
     
     async def stop(self):
         self.is_running = False
+        await self.memory_bank.close()
         self.logger.info(f"Agent {self.name} stopped")
\ No newline at end of file
@@ -1,98 +1,135 @@
-import google.generativeai as genai
-from typing import Dict, Any, List
+from opentelemetry import trace
+from typing import Dict, Any, AsyncIterator, List
 import asyncio
+import re
 from src.models.schemas import AgentType, AgentMessage, ResearchResult, ResearchTask
 from src.agents.base_agent import BaseAgent
 from src.tools.web_search import WebSearchTool
 from src.tools.custom_tools import DataAnalysisTool
-from src.observability.tracing import tracer
+from src.observability.tracing import traced
 from src.memory.memory_bank import MemoryBank
-from config.settings import settings
+from src.llm import gemini_client
+
+_FINDING_RE = re.compile(r'key finding|important|significant|major', re.IGNORECASE)
+
+_RESEARCH_PROMPT_HEADER = """
+Conduct {depth} research on: {topic}
+
+Provide:
+1. Comprehensive overview
+2. Key findings and insights
+3. Reliable sources
+4. Confidence assessment
+"""
 
 class ResearchAgent(BaseAgent):
     def __init__(self):
         super().__init__(AgentType.RESEARCH, "Research Specialist")
         self.web_search = WebSearchTool()
         self.data_analysis = DataAnalysisTool()
-        if settings.gemini_api_key:
-            genai.configure(api_key=settings.gemini_api_key)
-            self.model = genai.GenerativeModel('gemini-pro-latest')
-        else:
-            self.model = None
+        self.model = gemini_client.MODEL
         
+    @traced("research_agent.process_message")
     async def process_message(self, message: AgentMessage) -> Dict[str, Any]:
-        with tracer.start_as_current_span("research_agent.process_message") as span:
-            span.set_attribute("message_type", message.message_type)
-            
-            if message.message_type == "research_request":
-                return await self.execute_research(message.content)
-            else:
-                self.logger.warning(f"Unknown message type: {message.message_type}")
-                return {"status": "error", "reason": "unknown_message_type"}
+        trace.get_current_span().set_attribute("message_type", message.message_type)
+        
+        if message.message_type == "research_request":
+            return await self.execute_research(message.content)
+        else:
+            self.logger.warning(f"Unknown message type: {message.message_type}")
+            return {"status": "error", "reason": "unknown_message_type"}
     
     async def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         return await self.execute_research(task_data)
     
+    @traced("research_agent.execute_research")
     async def execute_research(self, research_data: Dict[str, Any]) -> Dict[str, Any]:
-        with tracer.start_as_current_span("research_agent.execute_research") as span:
-            topic = research_data.get("topic", "")
-            depth = research_data.get("depth", "comprehensive")
-            
-            self.logger.info(f"Starting research on topic: {topic}", depth=depth)
-            
-            search_results = await self.web_search.search_async(topic, max_results=5)
-            analyzed_data = await self.data_analysis.analyze_content(search_results)
+        span = trace.get_current_span()
+        
+        topic = research_data.get("topic", "")
+        depth = research_data.get("depth", "comprehensive")
+        
+        self.logger.info(f"Starting research on topic: {topic}", depth=depth)
+        
+        search_results = await self.web_search.search_async(topic, max_results=5)
+        urls = [result["url"] for result in search_results if "url" in result]
+        analyzed_data = await self.data_analysis.analyze_content(search_results)
+        
+        if self.model:
+            research_prompt = self._build_research_prompt(topic, depth, search_results, analyzed_data)
             
-            if self.model:
-                research_prompt = f"""
-                Conduct {depth} research on: {topic}
-                
-                Search Results: {search_results}
-                Analyzed Data: {analyzed_data}
-                
-                Provide:
-                1. Comprehensive overview
-                2. Key findings and insights
-                3. Reliable sources
-                4. Confidence assessment
-                """
-                
-                try:
-                    response = self.model.generate_content(research_prompt)
-                    research_content = response.text
-                    confidence_score = 0.85
-                except Exception as e:
-                    self.logger.warning(f"Gemini API failed, using fallback: {str(e)}")
-                    research_content = self._generate_fallback_research(topic, search_results)
-                    confidence_score = 0.70
-            else:
-                research_content = self._generate_fallback_research(topic, search_results)
+            try:
+                research_content = await self._call_llm(research_prompt)
+                confidence_score = 0.85
+            except Exception as e:
+                self.logger.warning(f"Gemini API failed, using fallback: {str(e)}")
+                research_content = self._generate_fallback_research(topic, search_results, urls)
                 confidence_score = 0.70
+        else:
+            research_content = self._generate_fallback_research(topic, search_results, urls)
+            confidence_score = 0.70
+        
+        result = ResearchResult(
+            task_id=research_data.get("task_id", ""),
+            content=research_content,
+            sources=urls,
+            key_findings=self._extract_key_findings(research_content),
+            confidence_score=confidence_score
+        )
+        
+        result_dict = result.model_dump()
+        
+        await self.memory_bank.store_memory(
+            f"research_{topic}",
+            result_dict,
+            metadata={"depth": depth, "topic": topic}
+        )
+        
+        span.set_attributes({"research.completed": True, "research.sources_count": len(result.sources)})
+        
+        return {
+            "status": "completed",
+            "result": result_dict,
+            "agent": self.agent_type.value
+        }
+    
+    async def stream_research(self, research_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield the research text as it is generated instead of waiting for the full response"""
+        topic = research_data.get("topic", "")
+        depth = research_data.get("depth", "comprehensive")
+        
+        search_results = await self.web_search.search_async(topic, max_results=5)
+        urls = [result["url"] for result in search_results if "url" in result]
+        
+        if self.model:
+            analyzed_data = await self.data_analysis.analyze_content(search_results)
+            research_prompt = self._build_research_prompt(topic, depth, search_results, analyzed_data)
             
-            result = ResearchResult(
-                task_id=research_data.get("task_id", ""),
-                content=research_content,
-                sources=[result["url"] for result in search_results if "url" in result],
-                key_findings=self._extract_key_findings(research_content),
-                confidence_score=confidence_score
-            )
-            
-            await self.memory_bank.store_memory(
-                f"research_{topic}",
-                result.dict(),
-                metadata={"depth": depth, "topic": topic}
-            )
-            
-            span.set_attribute("research.completed", True)
-            span.set_attribute("research.sources_count", len(result.sources))
-            
-            return {
-                "status": "completed",
-                "result": result.dict(),
-                "agent": self.agent_type.value
-            }
+            sent_any = False
+            try:
+                async for chunk in self._stream_llm(research_prompt):
+                    sent_any = True
+                    yield chunk
+                return
+            except Exception as e:
+                # Part of the answer already went out; abort the response so the client sees it is incomplete
+                if sent_any:
+                    self.logger.error(f"Gemini stream failed mid-response: {str(e)}", topic=topic)
+                    raise
+                self.logger.warning(f"Gemini API failed, using fallback: {str(e)}")
+        
+        yield self._generate_fallback_research(topic, search_results, urls)
+    
+    def _build_research_prompt(self, topic: str, depth: str, search_results: List[Dict],
+                               analyzed_data: Dict[str, Any]) -> List[str]:
+        # Gemini accepts multi-part contents, so the search data is not interpolated into one big string
+        return [
+            _RESEARCH_PROMPT_HEADER.format(depth=depth, topic=topic),
+            f"Search Results: {search_results}",
+            f"Analyzed Data: {analyzed_data}"
+        ]
     
-    def _generate_fallback_research(self, topic: str, search_results: List[Dict]) -> str:
+    def _generate_fallback_research(self, topic: str, search_results: List[Dict], urls: List[str]) -> str:
         return f"""
         # Research Report: {topic}
         
@@ -110,13 +147,9 @@ class ResearchAgent(BaseAgent):
         for continued growth and innovation across multiple sectors.
         
         ## Sources
-        {', '.join([result.get('url', '') for result in search_results if 'url' in result])}
+        {', '.join(urls)}
         """
     
     def _extract_key_findings(self, content: str) -> List[str]:
-        lines = content.split('\n')
-        findings = []
-        for line in lines:
-            if any(marker in line.lower() for marker in ['key finding', 'important', 'significant', 'major']):
-                findings.append(line.strip())
-        return findings[:5] if findings else ["Analysis completed successfully"]
\ No newline at end of file
+        findings = [line.strip() for line in content.split('\n') if _FINDING_RE.search(line)][:5]
+        return findings if findings else ["Analysis completed successfully"]
\ No newline at end of file
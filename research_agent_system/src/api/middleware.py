@@ -1,55 +1,61 @@
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from src.observability.metrics import metrics
 from src.observability.logging import get_logger
 
 logger = get_logger(__name__)
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Record metrics
-        endpoint = request.url.path
-        method = request.method
-        status_code = response.status_code
-        
-        metrics.record_api_request(
-            endpoint=endpoint,
-            method=method,
-            status_code=status_code,
-            duration=duration
-        )
+# Scraped by probes and dashboards every few seconds; only worth a log line when they fail
+_LOW_VALUE_PATHS = frozenset({"/health", "/metrics", "/status"})
+
+class MetricsMiddleware:
+    # Plain ASGI middleware: no Request/Response objects and no response body buffering
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Log request
-        logger.info(
-            "API request completed",
-            method=method,
-            endpoint=endpoint,
-            status_code=status_code,
-            duration_ms=round(duration * 1000, 2),
-            client_ip=request.client.host if request.client else "unknown"
-        )
+        start_time = time.perf_counter()
+        status_code = 500
         
-        return response
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Log incoming request
-        logger.info(
-            "Incoming request",
-            method=request.method,
-            endpoint=request.url.path,
-            client_ip=request.client.host if request.client else "unknown",
-            user_agent=request.headers.get("user-agent", "unknown")
-        )
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Expose time spent in the app up to the first response byte to clients
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f"app;dur={duration_ms:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
         
-        response = await call_next(request)
-        return response
\ No newline at end of file
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Calculate duration
+            duration = time.perf_counter() - start_time
+            
+            # Record metrics
+            endpoint = scope["path"]
+            method = scope["method"]
+            
+            metrics.record_api_request(
+                endpoint=endpoint,
+                method=method,
+                status_code=status_code,
+                duration=duration
+            )
+            
+            # Log request
+            if status_code >= 400 or endpoint not in _LOW_VALUE_PATHS:
+                client = scope.get("client")
+                logger.info(
+                    "API request completed",
+                    method=method,
+                    endpoint=endpoint,
+                    status_code=status_code,
+                    duration_ms=round(duration * 1000, 2),
+                    client_ip=client[0] if client else "unknown"
+                )
\ No newline at end of file
@@ -1,25 +1,39 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
 import asyncio
+import time
+import orjson
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from src.api.middleware import MetricsMiddleware, LoggingMiddleware
-from src.observability.metrics import metrics
+from src.api.middleware import MetricsMiddleware
+from src.observability.metrics import metrics, CONTENT_TYPE
 from src.observability.logging import get_logger
+from src.observability.tracing import init_tracing, shutdown_tracing
 from src.memory.memory_bank import MemoryBank
 from src.memory.session_manager import SessionManager
+from src.memory.task_store import TaskStore
 from src.agents.research_agent import ResearchAgent
 from src.agents.writing_agent import WritingAgent
 from src.agents.analysis_agent import AnalysisAgent
 from src.agents.coordinator_agent import CoordinatorAgent
+from src.tools.http_session import close_session
+from config.settings import settings
+
+try:
+    from arq import create_pool
+    from arq.connections import RedisSettings
+except ImportError:  # optional: without arq, tasks run as in-process background tasks
+    create_pool = None
 
 logger = get_logger(__name__)
 
 # Initialize components
 memory_bank = MemoryBank()
+task_store = TaskStore()
 session_manager = SessionManager()
 research_agent = ResearchAgent()
 writing_agent = WritingAgent()
@@ -37,7 +51,6 @@ app = FastAPI(
 
 # Add middleware
 app.add_middleware(MetricsMiddleware)
-app.add_middleware(LoggingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -48,7 +61,7 @@ app.add_middleware(
 
 # Data models
 class ResearchRequest(BaseModel):
-    topic: str
+    topic: str = Field(..., min_length=1)
     content_type: str = "article"
     tone: str = "professional"
     length: str = "medium"
@@ -72,22 +85,73 @@ class HealthResponse(BaseModel):
     version: str
     components: Dict[str, str]
 
-# Storage for active tasks
-active_tasks: Dict[str, Dict[str, Any]] = {}
+class ORJSONResponse(JSONResponse):
+    """JSON rendered by orjson, for endpoints returning large plain dicts without a response model"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+def _format_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="milliseconds")
+
+def _task_response(task: Dict[str, Any]) -> Dict[str, Any]:
+    # Tasks keep time.time() floats internally; clients get ISO strings
+    response = dict(task)
+    for field in ("created_at", "completed_at"):
+        if isinstance(response.get(field), (int, float)):
+            response[field] = _format_timestamp(response[field])
+    return response
+
+# Queue for the ARQ research worker; None means tasks run in this process
+arq_pool = None
+
+# Set once a task reaches a terminal state, so /tasks/{id}/wait can block on it
+task_events: Dict[str, asyncio.Event] = {}
+# Seconds between store checks when waiting on a task owned by another worker
+_WAIT_POLL_INTERVAL = 0.5
+# In-process execution: at most max_concurrent_tasks run at once, the rest wait their turn
+_task_slots = asyncio.Semaphore(settings.max_concurrent_tasks)
+_pending_tasks = 0
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize agents and components on startup"""
     logger.info("Starting Research Agent System...")
     
+    # Set up per process: the SDK's export thread does not survive uvicorn forking workers
+    init_tracing()
+    
+    # Probe Redis once up front instead of on every memory operation
+    await memory_bank.initialize()
+    
     # Start all agents
     await research_agent.start()
     await writing_agent.start()
     await analysis_agent.start()
     await coordinator_agent.start()
     
+    if settings.task_queue_enabled:
+        await connect_task_queue()
+    
     logger.info("All agents started successfully")
 
+async def connect_task_queue():
+    global arq_pool
+    
+    if create_pool is None:
+        logger.warning("Task queue enabled but arq is not installed, running tasks in-process")
+        return
+    
+    try:
+        arq_pool = await create_pool(RedisSettings.from_dsn(settings.redis_url))
+        logger.info("Research tasks will be sent to the ARQ worker queue")
+    except Exception as e:
+        logger.warning(f"Task queue connection failed, running tasks in-process: {str(e)}")
+        arq_pool = None
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
@@ -97,6 +161,13 @@ async def shutdown_event():
     await writing_agent.stop()
     await analysis_agent.stop()
     await coordinator_agent.stop()
+    await close_session()
+    
+    if arq_pool is not None:
+        await arq_pool.aclose()
+    
+    metrics.mark_process_dead()
+    shutdown_tracing()
     
     logger.info("All agents stopped")
 
@@ -106,10 +177,12 @@ async def root():
     return {
         "message": "Research Agent System API",
         "version": "1.0.0",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso(),
         "endpoints": {
             "/research": "POST - Create research task",
+            "/research/stream": "POST - Stream research text as it is generated",
             "/tasks/{id}": "GET - Get task status",
+            "/tasks/{id}/wait": "GET - Wait for task completion",
             "/tasks": "GET - List all tasks",
             "/status": "GET - System status",
             "/health": "GET - Health check",
@@ -121,7 +194,13 @@ async def root():
 @app.post("/research", response_model=TaskResponse)
 async def create_research_task(request: ResearchRequest, background_tasks: BackgroundTasks):
     """Create a new research task"""
-    task_id = str(uuid.uuid4())
+    global _pending_tasks
+    
+    # Shed load instead of queuing without limit when tasks run in this process
+    if arq_pool is None and _pending_tasks >= settings.max_pending_tasks:
+        raise HTTPException(status_code=503, detail="Too many pending research tasks, try again later")
+    
+    task_id = uuid.uuid4().hex
     
     task_data = {
         "task_id": task_id,
@@ -132,19 +211,32 @@ async def create_research_task(request: ResearchRequest, background_tasks: Backg
         "depth": request.depth
     }
     
-    # Store task in active tasks
-    active_tasks[task_id] = {
+    # Store task in the task store
+    await task_store.create_task(task_id, {
+        "task_id": task_id,
         "status": "pending",
-        "request": request.dict(),
-        "created_at": datetime.now().isoformat(),
+        "request": request.model_dump(),
+        "created_at": time.time(),
         "result": None
-    }
+    })
     
     # Update metrics
-    metrics.update_active_tasks(len(active_tasks))
+    metrics.update_active_tasks(await task_store.count())
     
-    # Execute task in background
-    background_tasks.add_task(execute_research_task, task_id, task_data)
+    # Execute task on the worker queue, or in background if there is none
+    if not await enqueue_research_task(task_id, task_data):
+        # A failed enqueue lands here even with a queue configured, so the cap applies again
+        if _pending_tasks >= settings.max_pending_tasks:
+            await task_store.update_task(task_id, {
+                "status": "failed",
+                "error": "Too many pending research tasks",
+                "completed_at": time.time()
+            })
+            raise HTTPException(status_code=503, detail="Too many pending research tasks, try again later")
+        
+        task_events[task_id] = asyncio.Event()
+        _pending_tasks += 1
+        background_tasks.add_task(run_research_task_in_process, task_id, task_data)
     
     logger.info(f"Created research task", task_id=task_id, topic=request.topic)
     
@@ -154,31 +246,81 @@ async def create_research_task(request: ResearchRequest, background_tasks: Backg
         message=f"Research task started for topic: {request.topic}"
     )
 
+async def run_research_task_in_process(task_id: str, task_data: Dict[str, Any]):
+    global _pending_tasks
+    
+    try:
+        async with _task_slots:
+            await execute_research_task(task_id, task_data)
+    finally:
+        _pending_tasks -= 1
+
+async def enqueue_research_task(task_id: str, task_data: Dict[str, Any]) -> bool:
+    if arq_pool is None:
+        return False
+    
+    try:
+        await arq_pool.enqueue_job("execute_research_task", task_id, task_data)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to enqueue research task, running in-process", task_id=task_id, error=str(e))
+        return False
+
+@app.post("/research/stream")
+async def stream_research(request: ResearchRequest):
+    """Stream research content to the client while the model is still generating it"""
+    logger.info(f"Streaming research", topic=request.topic)
+    return StreamingResponse(research_agent.stream_research(request.model_dump()), media_type="text/plain")
+
 @app.get("/tasks/{task_id}")
 async def get_task_status(task_id: str):
     """Get status of a specific task"""
-    if task_id not in active_tasks:
+    task = await task_store.get_task(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return active_tasks[task_id]
+    return ORJSONResponse(_task_response(task))
+
+@app.get("/tasks/{task_id}/wait")
+async def wait_for_task(task_id: str, timeout: float = Query(30.0, ge=0, le=60)):
+    """Block until a task finishes or the timeout passes, then return its status"""
+    task = await task_store.get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    event = task_events.get(task_id)
+    if event is not None:
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        task = await task_store.get_task(task_id) or task
+    else:
+        # The task may be running in another worker process; watch the shared store instead
+        deadline = time.monotonic() + timeout
+        while task["status"] in ("pending", "in_progress") and time.monotonic() < deadline:
+            await asyncio.sleep(min(_WAIT_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+            task = await task_store.get_task(task_id) or task
+    
+    return ORJSONResponse(_task_response(task))
 
 @app.get("/tasks")
 async def list_tasks():
-    """List all tasks"""
+    """List the most recent tasks"""
     tasks_summary = []
-    for task_id, task_data in active_tasks.items():
+    for task_data in await task_store.list_tasks():
         tasks_summary.append({
-            "task_id": task_id,
+            "task_id": task_data["task_id"],
             "topic": task_data["request"]["topic"],
             "status": task_data["status"],
-            "created_at": task_data["created_at"],
+            "created_at": _format_timestamp(task_data["created_at"]),
             "content_type": task_data["request"]["content_type"]
         })
     
-    return {
-        "total_tasks": len(active_tasks),
+    return ORJSONResponse({
+        "total_tasks": await task_store.count(),
         "tasks": tasks_summary
-    }
+    })
 
 @app.get("/status", response_model=SystemStatus)
 async def get_system_status():
@@ -187,9 +329,10 @@ async def get_system_status():
     session_stats = await session_manager.get_session_stats()
     coordinator_metrics = await coordinator_agent.get_system_metrics()
     
-    return SystemStatus(
+    # Fields come from our own stores, so skip validation here; the response model still serializes
+    return SystemStatus.model_construct(
         status="operational",
-        active_tasks=len(active_tasks),
+        active_tasks=await task_store.count(),
         agents_online=["research", "writing", "analysis", "coordinator"],
         memory_entries=memory_stats.get("total_memories", 0),
         active_sessions=session_stats.get("total_sessions", 0)
@@ -204,31 +347,42 @@ async def health_check():
         "writing_agent": "healthy" if writing_agent.is_running else "unhealthy",
         "analysis_agent": "healthy" if analysis_agent.is_running else "unhealthy",
         "coordinator_agent": "healthy" if coordinator_agent.is_running else "unhealthy",
-        "memory_bank": "healthy",
+        "memory_bank": await memory_bank.health(),
         "session_manager": "healthy"
     }
     
-    return HealthResponse(
+    return HealthResponse.model_construct(
         status="healthy",
-        timestamp=datetime.now().isoformat(),
+        timestamp=_now_iso(),
         version="1.0.0",
         components=components
     )
 
-@app.get("/metrics")
-async def get_metrics():
+@app.api_route("/metrics", methods=["GET", "HEAD"])
+async def get_metrics(request: Request):
     """Prometheus metrics endpoint"""
-    return metrics.get_metrics()
+    # HEAD only needs the headers, so the registry isn't serialized for it
+    if request.method == "HEAD":
+        return Response(media_type=CONTENT_TYPE)
+    return Response(content=metrics.get_metrics(), media_type=CONTENT_TYPE)
 
 @app.get("/memory/stats")
 async def get_memory_stats():
     """Get memory bank statistics"""
-    return await memory_bank.get_memory_stats()
+    return ORJSONResponse(await memory_bank.get_memory_stats())
 
 @app.get("/sessions/stats")
 async def get_session_stats():
     """Get session manager statistics"""
-    return await session_manager.get_session_stats()
+    return ORJSONResponse(await session_manager.get_session_stats())
+
+@app.get("/sessions")
+async def list_sessions(offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    """Page through sessions, most recently updated first"""
+    return ORJSONResponse({
+        "offset": offset,
+        "sessions": await session_manager.list_sessions(offset=offset, limit=limit)
+    })
 
 async def execute_research_task(task_id: str, task_data: Dict[str, Any]):
     """Execute research task using coordinator agent"""
@@ -236,30 +390,35 @@ async def execute_research_task(task_id: str, task_data: Dict[str, Any]):
         logger.info(f"Executing research task", task_id=task_id)
         
         # Update task status
-        active_tasks[task_id]["status"] = "in_progress"
+        await task_store.update_task(task_id, {"status": "in_progress"})
         
         # Execute task through coordinator
         result = await coordinator_agent.coordinate_task(task_data)
         
         # Update task with result
-        active_tasks[task_id].update({
+        await task_store.update_task(task_id, {
             "status": result.get("status", "completed"),
             "result": result,
-            "completed_at": datetime.now().isoformat()
+            "completed_at": time.time()
         })
         
         # Update metrics
-        metrics.update_active_tasks(len(active_tasks))
+        metrics.update_active_tasks(await task_store.count())
         
         logger.info(f"Research task completed", task_id=task_id, status=result.get("status"))
         
     except Exception as e:
         logger.error(f"Research task failed", task_id=task_id, error=str(e))
         
-        active_tasks[task_id].update({
+        await task_store.update_task(task_id, {
             "status": "failed",
             "error": str(e),
-            "completed_at": datetime.now().isoformat()
+            "completed_at": time.time()
         })
         
-        metrics.update_active_tasks(len(active_tasks))
\ No newline at end of file
+        metrics.update_active_tasks(await task_store.count())
+    
+    finally:
+        event = task_events.pop(task_id, None)
+        if event is not None:
+            event.set()
\ No newline at end of file
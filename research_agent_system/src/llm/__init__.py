@@ -0,0 +1 @@
+"""LLM client modules package"""
\ No newline at end of file
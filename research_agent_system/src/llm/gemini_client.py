@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional, Union
+from src.observability.logging import get_logger
+from config.settings import settings
+
+logger = get_logger(__name__)
+
+def _create_model() -> Optional[genai.GenerativeModel]:
+    if not settings.gemini_api_key:
+        return None
+    
+    genai.configure(api_key=settings.gemini_api_key)
+    return genai.GenerativeModel(settings.gemini_model)
+
+# Configured once per process and shared by every agent, so all of them
+# reuse the same underlying gRPC channel instead of building their own
+MODEL = _create_model()
+
+# Bounded pool for the blocking SDK calls; the default executor would grow
+# without limit under load
+LLM_EXECUTOR = ThreadPoolExecutor(max_workers=settings.llm_max_workers, thread_name_prefix="gemini")
+
+_STREAM_END = object()
+
+def _log_producer_failure(future: asyncio.Future):
+    # Nobody awaits the producer once its consumer has gone, so report failures here
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Gemini stream producer failed: {str(future.exception())}")
+
+async def stream(prompt: Union[str, List[str]], model: Optional[genai.GenerativeModel] = None) -> AsyncIterator[str]:
+    """Yield response text chunks as Gemini produces them"""
+    model = model or MODEL
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    # Set when the consumer stops early (disconnect, cancellation, timeout) so the worker quits too
+    stop = threading.Event()
+    
+    def deliver(item):
+        # The loop may already be closed when a straggling worker hands back a chunk
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+    
+    # The SDK's streaming iterator is blocking, so drain it on the LLM pool and
+    # hand each chunk back to the event loop as it arrives
+    def produce():
+        try:
+            for chunk in model.generate_content(prompt, stream=True):
+                if stop.is_set():
+                    break
+                deliver(chunk.text)
+        except Exception as e:
+            deliver(e)
+        finally:
+            deliver(_STREAM_END)
+    
+    producer = loop.run_in_executor(LLM_EXECUTOR, produce)
+    producer.add_done_callback(_log_producer_failure)
+    
+    try:
+        while (item := await asyncio.wait_for(queue.get(), settings.llm_chunk_timeout)) is not _STREAM_END:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
\ No newline at end of file
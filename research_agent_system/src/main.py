@@ -3,16 +3,43 @@ import uvicorn
 from fastapi import FastAPI
 import sys
 import os
+from typing import Callable
 
 # Add the parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.api.routes import app as fastapi_app
 from src.observability.logging import get_logger
+from src.observability.metrics import prepare_multiprocess_dir
 from config.settings import settings
 
 logger = get_logger(__name__)
 
+def _loop_implementation():
+    """uvloop (winloop on Windows) when installed, otherwise None"""
+    try:
+        if sys.platform == "win32":
+            import winloop as loop_impl
+        else:
+            import uvloop as loop_impl
+    except ImportError:
+        return None
+    return loop_impl
+
+def install_event_loop_policy():
+    """Use uvloop (winloop on Windows) when installed, otherwise keep the stdlib loop"""
+    loop_impl = _loop_implementation()
+    if loop_impl is None:
+        logger.info("uvloop not available, using the default asyncio event loop")
+        return
+    
+    asyncio.set_event_loop_policy(loop_impl.EventLoopPolicy())
+
+def event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop]:
+    """Creates the same kind of loop install_event_loop_policy selects, without touching the global policy"""
+    loop_impl = _loop_implementation()
+    return loop_impl.new_event_loop if loop_impl else asyncio.new_event_loop
+
 class ResearchAgentSystem:
     def __init__(self):
         self.app = fastapi_app
@@ -26,6 +53,7 @@ class ResearchAgentSystem:
                 app=self.app,
                 host="0.0.0.0",
                 port=8000,
+                http="auto",
                 log_level="info"
             )
             server = uvicorn.Server(config)
@@ -50,5 +78,23 @@ async def main():
         logger.error(f"System error: {str(e)}")
         await system.stop()
 
+def run_workers():
+    # Each worker imports the app itself, so no agent or client is shared across processes;
+    # task state and the LLM cache are shared through Redis
+    prepare_multiprocess_dir()
+    uvicorn.run(
+        "src.api.routes:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=settings.workers,
+        http="auto",
+        log_level="info"
+    )
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if settings.workers > 1:
+        run_workers()
+    else:
+        # serve() runs inside asyncio.run, so the loop has to be chosen before it starts
+        install_event_loop_policy()
+        asyncio.run(main())
\ No newline at end of file
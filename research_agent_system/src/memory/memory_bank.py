@@ -1,49 +1,81 @@
 import asyncio
+import time
 from typing import Dict, Any, List, Optional
 import redis.asyncio as redis
-import json
+import msgpack
 from src.observability.logging import get_logger
 from config.settings import settings
 
 logger = get_logger(__name__)
 
+# Maximum number of queued writes sent to Redis in one pipeline
+_WRITE_BATCH_SIZE = 100
+_MEMORY_TTL = 3600
+# Sorted set of memory keys scored by expiry time, so lookups never need KEYS
+_MEMORY_INDEX = "memory:index"
+# Keys fetched per MGET when loading search results
+_MGET_BATCH_SIZE = 500
+
 class MemoryBank:
     def __init__(self, redis_url: str = None):
         self.redis_url = redis_url or settings.redis_url
+        # Memories are stored as msgpack, so responses stay raw bytes
+        self.pool = redis.ConnectionPool.from_url(
+            self.redis_url,
+            max_connections=settings.redis_max_connections,
+            decode_responses=False
+        )
+        # Set by initialize() once Redis answers; until then memories use the fallback storage
         self.redis_client = None
         self.logger = get_logger(__name__)
         self.fallback_storage: Dict[str, Any] = {}
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
         
     async def initialize(self):
-        if not self.redis_client:
+        """Probe Redis once; called from startup rather than on every operation"""
+        if self._initialized:
+            return
+        
+        async with self._init_lock:
+            # Callers that queued behind the probe reuse its outcome
+            if self._initialized:
+                return
+            
+            client = redis.Redis(connection_pool=self.pool)
             try:
-                self.redis_client = redis.from_url(
-                    self.redis_url, 
-                    encoding="utf-8", 
-                    decode_responses=True
-                )
-                await self.redis_client.ping()
+                await client.ping()
+                self.redis_client = client
                 self.logger.info("MemoryBank initialized with Redis")
             except Exception as e:
                 self.logger.warning(f"Redis connection failed, using fallback storage: {str(e)}")
-                self.redis_client = None
+            finally:
+                # Set only once the outcome is known, so nobody writes to the fallback mid-probe
+                self._initialized = True
+    
+    async def health(self) -> str:
+        if not self.redis_client:
+            return "fallback"
+        try:
+            await self.redis_client.ping()
+            return "healthy"
+        except Exception as e:
+            self.logger.warning(f"Redis health check failed: {str(e)}")
+            return "unhealthy"
     
     async def store_memory(self, key: str, data: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None):
-        await self.initialize()
-        
         memory_data = {
             "data": data,
             "metadata": metadata or {},
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": time.time()
         }
         
         try:
             if self.redis_client:
-                await self.redis_client.setex(
-                    f"memory:{key}", 
-                    3600,  # 1 hour TTL
-                    json.dumps(memory_data)
-                )
+                # Fire-and-forget: the background writer sends queued entries in batches
+                self._enqueue_write(f"memory:{key}", msgpack.packb(memory_data, use_bin_type=True))
             else:
                 self.fallback_storage[f"memory:{key}"] = memory_data
                 
@@ -51,14 +83,72 @@ class MemoryBank:
         except Exception as e:
             self.logger.error(f"Failed to store memory: {str(e)}")
     
+    def _writer_active(self) -> bool:
+        return (
+            self._writer_task is not None
+            and not self._writer_task.done()
+            and self._writer_task.get_loop() is asyncio.get_running_loop()
+        )
+    
+    def _enqueue_write(self, key: str, payload: bytes):
+        if not self._writer_active():
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._flush_loop(self._write_queue))
+        
+        self._write_queue.put_nowait((key, payload))
+    
+    async def _flush_loop(self, queue: asyncio.Queue):
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _WRITE_BATCH_SIZE:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                await self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _write_batch(self, batch: List[tuple]):
+        try:
+            now = time.time()
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, payload in batch:
+                    pipe.setex(key, _MEMORY_TTL, payload)  # 1 hour TTL
+                pipe.zadd(_MEMORY_INDEX, {key: now + _MEMORY_TTL for key, _ in batch})
+                # Entries whose keys have already expired
+                pipe.zremrangebyscore(_MEMORY_INDEX, "-inf", now)
+                await pipe.execute()
+            
+            self.logger.debug(f"Flushed {len(batch)} memories to Redis")
+        except Exception as e:
+            self.logger.error(f"Failed to store memory batch: {str(e)}")
+    
+    async def flush(self):
+        """Wait until every queued write has been sent to Redis"""
+        if self._writer_active():
+            await self._write_queue.join()
+    
+    async def close(self):
+        if self._writer_active():
+            await self._write_queue.join()
+            self._writer_task.cancel()
+        
+        self._writer_task = None
+        self._write_queue = None
+        await self.pool.disconnect()
+    
     async def retrieve_memory(self, key: str) -> Optional[Dict[str, Any]]:
-        await self.initialize()
+        await self.flush()
         
         try:
             if self.redis_client:
                 data = await self.redis_client.get(f"memory:{key}")
                 if data:
-                    return json.loads(data)
+                    return msgpack.unpackb(data, raw=False)
             else:
                 return self.fallback_storage.get(f"memory:{key}")
                 
@@ -68,17 +158,28 @@ class MemoryBank:
         return None
     
     async def search_memories(self, pattern: str) -> List[Dict[str, Any]]:
-        await self.initialize()
+        await self.flush()
         
         try:
             if self.redis_client:
-                keys = await self.redis_client.keys(f"memory:*{pattern}*")
+                # Incremental ZSCAN over the index instead of a blocking KEYS over the keyspace
+                keys = [
+                    key async for key, _ in
+                    self.redis_client.zscan_iter(_MEMORY_INDEX, match=f"memory:*{pattern}*", count=500)
+                ]
                 memories = []
                 
-                for key in keys:
-                    data = await self.redis_client.get(key)
-                    if data:
-                        memories.append(json.loads(data))
+                if keys:
+                    # All MGET batches go out in one pipeline, so this is a single round trip
+                    async with self.redis_client.pipeline(transaction=False) as pipe:
+                        for i in range(0, len(keys), _MGET_BATCH_SIZE):
+                            pipe.mget(keys[i:i + _MGET_BATCH_SIZE])
+                        batches = await pipe.execute()
+                    
+                    memories = [
+                        msgpack.unpackb(data, raw=False)
+                        for values in batches for data in values if data
+                    ]
                 
                 self.logger.debug(f"Found {len(memories)} memories for pattern: {pattern}")
                 return memories
@@ -94,32 +195,26 @@ class MemoryBank:
             return []
     
     async def clear_old_memories(self, older_than_seconds: int = 3600):
-        await self.initialize()
-        
+        # Redis entries expire through their TTL; only the fallback needs sweeping
         if self.redis_client:
-            try:
-                # Redis handles TTL automatically
-                self.logger.info("Redis TTL handles memory cleanup automatically")
-            except Exception as e:
-                self.logger.error(f"Failed to clear old memories: {str(e)}")
-        else:
-            # For fallback storage, we'd need to implement manual cleanup
-            current_time = asyncio.get_event_loop().time()
-            keys_to_remove = [
-                key for key, value in self.fallback_storage.items()
-                if current_time - value.get('timestamp', 0) > older_than_seconds
-            ]
-            for key in keys_to_remove:
-                del self.fallback_storage[key]
+            return
+        
+        current_time = time.time()
+        keys_to_remove = [
+            key for key, value in self.fallback_storage.items()
+            if current_time - value.get('timestamp', 0) > older_than_seconds
+        ]
+        for key in keys_to_remove:
+            del self.fallback_storage[key]
     
     async def get_memory_stats(self) -> Dict[str, Any]:
-        await self.initialize()
+        await self.flush()
         
         if self.redis_client:
             try:
-                keys = await self.redis_client.keys("memory:*")
+                total = await self.redis_client.zcount(_MEMORY_INDEX, f"({time.time()}", "+inf")
                 return {
-                    "total_memories": len(keys),
+                    "total_memories": total,
                     "storage_backend": "redis",
                     "status": "connected"
                 }
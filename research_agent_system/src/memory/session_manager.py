@@ -1,30 +1,104 @@
 import asyncio
-from typing import Dict, Any, Optional
+import itertools
+from collections import deque
+from typing import Dict, Any, List, Optional
 import time
 import uuid
+import msgpack
+import redis.asyncio as redis
 from src.observability.logging import get_logger
+from config.settings import settings
 
 logger = get_logger(__name__)
 
+# Session keys live in Redis as session:{id} (timestamps), session:{id}:state,
+# session:{id}:ctx (hashes) and session:{id}:hist (list), indexed by two sorted sets
+_SESSION_TTL = 86400
+_SESSIONS_BY_UPDATED = "sessions:by_updated"
+_SESSIONS_BY_CREATED = "sessions:by_created"
+# Seconds a stats snapshot is reused; scrapes and /status polls hit it repeatedly
+_STATS_CACHE_TTL = 1.0
+
+def _pack(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True, default=str)
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+def _session_keys(session_id: str) -> List[str]:
+    prefix = f"session:{session_id}"
+    return [prefix, f"{prefix}:state", f"{prefix}:ctx", f"{prefix}:hist"]
+
 class Session:
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, redis_client=None):
         self.session_id = session_id
-        self.created_at = time.time()
-        self.updated_at = time.time()
+        self.created_at = self.updated_at = time.time()
         self.state: Dict[str, Any] = {}
-        self.history: list[Dict[str, Any]] = []
+        # Oldest entries fall off once the session reaches max_history_entries
+        self.history: deque = deque(maxlen=settings.max_history_entries)
         self.context: Dict[str, Any] = {}
-        self.logger = get_logger(f"session.{session_id}")
+        self.redis_client = redis_client
+        self.logger = logger.bind(session_id=session_id)
+    
+    @classmethod
+    async def load(cls, session_id: str, redis_client) -> Optional["Session"]:
+        meta_key, state_key, ctx_key, hist_key = _session_keys(session_id)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(meta_key)
+            pipe.hgetall(state_key)
+            pipe.hgetall(ctx_key)
+            pipe.lrange(hist_key, -settings.max_history_entries, -1)
+            meta, state, context, history = await pipe.execute()
+        
+        if not meta:
+            return None
+        
+        session = cls(session_id, redis_client)
+        session.created_at = float(meta[b"created_at"])
+        session.updated_at = float(meta[b"updated_at"])
+        session.state = {key.decode(): _unpack(value) for key, value in state.items()}
+        session.context = {key.decode(): _unpack(value) for key, value in context.items()}
+        session.history.extend(_unpack(entry) for entry in history)
+        return session
+    
+    async def _persist(self, state: Optional[Dict[str, Any]] = None, context: Optional[Dict[str, Any]] = None,
+                       history_entry: Optional[Dict[str, Any]] = None):
+        """Write changed fields through to Redis in one round trip"""
+        if not self.redis_client:
+            return
+        
+        meta_key, state_key, ctx_key, hist_key = _session_keys(self.session_id)
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                if state:
+                    pipe.hset(state_key, mapping={key: _pack(value) for key, value in state.items()})
+                    pipe.expire(state_key, _SESSION_TTL)
+                if context:
+                    pipe.hset(ctx_key, mapping={key: _pack(value) for key, value in context.items()})
+                    pipe.expire(ctx_key, _SESSION_TTL)
+                if history_entry is not None:
+                    pipe.rpush(hist_key, _pack(history_entry))
+                    pipe.ltrim(hist_key, -settings.max_history_entries, -1)
+                    pipe.expire(hist_key, _SESSION_TTL)
+                pipe.hset(meta_key, mapping={"created_at": self.created_at, "updated_at": self.updated_at})
+                pipe.expire(meta_key, _SESSION_TTL)
+                pipe.zadd(_SESSIONS_BY_UPDATED, {self.session_id: self.updated_at})
+                await pipe.execute()
+        except Exception as e:
+            self.logger.error(f"Failed to persist session: {str(e)}")
     
     async def update_state(self, key: str, value: Any):
         self.state[key] = value
-        self.updated_at = time.time()
-        self.history.append({
-            "timestamp": time.time(),
+        now = time.time()
+        self.updated_at = now
+        entry = {
+            "timestamp": now,
             "action": "state_update",
             "key": key,
             "value": value
-        })
+        }
+        self.history.append(entry)
+        await self._persist(state={key: value}, history_entry=entry)
         self.logger.debug(f"Session state updated", key=key)
     
     async def get_state(self, key: str) -> Any:
@@ -33,20 +107,27 @@ class Session:
     async def update_context(self, context_data: Dict[str, Any]):
         self.context.update(context_data)
         self.updated_at = time.time()
+        await self._persist(context=context_data)
     
     async def get_context(self) -> Dict[str, Any]:
         return self.context.copy()
     
     async def add_to_history(self, event: str, data: Any = None):
-        self.history.append({
-            "timestamp": time.time(),
+        now = time.time()
+        entry = {
+            "timestamp": now,
             "event": event,
             "data": data
-        })
-        self.updated_at = time.time()
+        }
+        self.history.append(entry)
+        self.updated_at = now
+        await self._persist(history_entry=entry)
     
     async def get_full_history(self) -> list[Dict[str, Any]]:
-        return self.history.copy()
+        return list(self.history)
+    
+    async def get_recent_history(self, n: int) -> list[Dict[str, Any]]:
+        return list(itertools.islice(self.history, max(0, len(self.history) - n), None))
     
     async def get_session_info(self) -> Dict[str, Any]:
         return {
@@ -60,53 +141,217 @@ class Session:
         }
 
 class SessionManager:
-    def __init__(self):
+    def __init__(self, redis_url: str = None):
+        self.redis_url = redis_url or settings.redis_url
+        self.redis_client = None
         self.sessions: Dict[str, Session] = {}
+        self._stats_cache: Optional[tuple] = None
         self.logger = get_logger(__name__)
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+    
+    async def initialize(self):
+        """Probe Redis once; the backend never changes afterwards, so in-memory sessions stay reachable"""
+        if self._initialized:
+            return
+        
+        async with self._init_lock:
+            # Callers that queued behind the probe reuse its outcome
+            if self._initialized:
+                return
+            
+            client = redis.from_url(self.redis_url)
+            try:
+                await client.ping()
+                self.redis_client = client
+                self.logger.info("SessionManager initialized with Redis")
+            except Exception as e:
+                self.logger.warning(f"Redis connection failed, keeping sessions in memory: {str(e)}")
+                await client.aclose()
+            finally:
+                self._initialized = True
     
     async def create_session(self, session_id: str = None) -> Session:
+        await self.initialize()
+        
         if not session_id:
-            session_id = str(uuid.uuid4())
+            session_id = uuid.uuid4().hex
             
-        session = Session(session_id)
+        session = Session(session_id, self.redis_client)
         self.sessions[session_id] = session
+        self._stats_cache = None
+        
+        if self.redis_client:
+            try:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    meta_key = f"session:{session_id}"
+                    pipe.hset(meta_key, mapping={"created_at": session.created_at, "updated_at": session.updated_at})
+                    pipe.expire(meta_key, _SESSION_TTL)
+                    pipe.zadd(_SESSIONS_BY_CREATED, {session_id: session.created_at})
+                    pipe.zadd(_SESSIONS_BY_UPDATED, {session_id: session.updated_at})
+                    # Drop index entries for sessions whose keys have expired
+                    cutoff = session.created_at - _SESSION_TTL
+                    pipe.zremrangebyscore(_SESSIONS_BY_UPDATED, "-inf", cutoff)
+                    pipe.zremrangebyscore(_SESSIONS_BY_CREATED, "-inf", cutoff)
+                    await pipe.execute()
+            except Exception as e:
+                self.logger.error(f"Failed to persist session: {str(e)}")
+        
         self.logger.info(f"Created new session: {session_id}")
         return session
     
     async def get_session(self, session_id: str) -> Optional[Session]:
-        return self.sessions.get(session_id)
+        session = self.sessions.get(session_id)
+        if session is not None:
+            return session
+        
+        # Created by another worker
+        await self.initialize()
+        if self.redis_client:
+            try:
+                return await Session.load(session_id, self.redis_client)
+            except Exception as e:
+                self.logger.error(f"Failed to load session: {str(e)}")
+        return None
     
     async def end_session(self, session_id: str):
         if session_id in self.sessions:
             session = self.sessions[session_id]
             session_info = await session.get_session_info()
             del self.sessions[session_id]
+            self._stats_cache = None
             self.logger.info(f"Ended session: {session_id}", duration=session_info["duration_seconds"])
+        
+        await self.initialize()
+        if self.redis_client:
+            await self._delete_sessions([session_id])
+    
+    async def _delete_sessions(self, session_ids: List[str]):
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.delete(*_session_keys(session_id))
+                pipe.zrem(_SESSIONS_BY_UPDATED, *session_ids)
+                pipe.zrem(_SESSIONS_BY_CREATED, *session_ids)
+                await pipe.execute()
+            self._stats_cache = None
+        except Exception as e:
+            self.logger.error(f"Failed to delete sessions: {str(e)}")
     
     async def cleanup_old_sessions(self, max_age_seconds: int = 3600):
+        await self.initialize()
         current_time = time.time()
-        expired_sessions = [
-            session_id for session_id, session in self.sessions.items()
-            if current_time - session.updated_at > max_age_seconds
-        ]
         
-        for session_id in expired_sessions:
-            await self.end_session(session_id)
+        if self.redis_client:
+            try:
+                expired_sessions = [
+                    session_id.decode() for session_id in
+                    await self.redis_client.zrangebyscore(_SESSIONS_BY_UPDATED, "-inf", current_time - max_age_seconds)
+                ]
+            except Exception as e:
+                self.logger.error(f"Failed to find expired sessions: {str(e)}")
+                return
+            
+            if expired_sessions:
+                await self._delete_sessions(expired_sessions)
+                for session_id in expired_sessions:
+                    self.sessions.pop(session_id, None)
+        else:
+            expired_sessions = [
+                session_id for session_id, session in self.sessions.items()
+                if current_time - session.updated_at > max_age_seconds
+            ]
+            
+            for session_id in expired_sessions:
+                await self.end_session(session_id)
         
         if expired_sessions:
             self.logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
     
     async def get_session_stats(self) -> Dict[str, Any]:
-        current_time = time.time()
-        active_sessions = []
+        """Session counts only; per-session details are paged through list_sessions"""
+        now = time.monotonic()
+        if self._stats_cache is not None and self._stats_cache[0] > now:
+            return self._stats_cache[1]
         
-        for session_id, session in self.sessions.items():
-            session_info = await session.get_session_info()
-            active_sessions.append(session_info)
+        await self.initialize()
+        stats = None
+        if self.redis_client:
+            try:
+                stats = await self._get_redis_session_stats()
+            except Exception as e:
+                self.logger.error(f"Failed to read session stats: {str(e)}")
+        
+        if stats is None:
+            oldest = newest = 0
+            for session in self.sessions.values():
+                if not oldest or session.created_at < oldest:
+                    oldest = session.created_at
+                if session.created_at > newest:
+                    newest = session.created_at
+            stats = {
+                "total_sessions": len(self.sessions),
+                "oldest_session": oldest,
+                "newest_session": newest
+            }
+        
+        self._stats_cache = (now + _STATS_CACHE_TTL, stats)
+        return stats
+    
+    async def _get_redis_session_stats(self) -> Dict[str, Any]:
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.zcard(_SESSIONS_BY_UPDATED)
+            pipe.zrange(_SESSIONS_BY_CREATED, 0, 0, withscores=True)
+            pipe.zrevrange(_SESSIONS_BY_CREATED, 0, 0, withscores=True)
+            total, oldest, newest = await pipe.execute()
         
         return {
-            "total_sessions": len(self.sessions),
-            "active_sessions": active_sessions,
-            "oldest_session": min([s.created_at for s in self.sessions.values()]) if self.sessions else 0,
-            "newest_session": max([s.created_at for s in self.sessions.values()]) if self.sessions else 0
-        }
\ No newline at end of file
+            "total_sessions": total,
+            "oldest_session": oldest[0][1] if oldest else 0,
+            "newest_session": newest[0][1] if newest else 0
+        }
+    
+    async def list_sessions(self, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recently updated sessions first"""
+        await self.initialize()
+        
+        if self.redis_client:
+            try:
+                return await self._list_redis_sessions(offset, limit)
+            except Exception as e:
+                self.logger.error(f"Failed to list sessions: {str(e)}")
+        
+        sessions = sorted(self.sessions.values(), key=lambda session: session.updated_at, reverse=True)
+        return [await session.get_session_info() for session in sessions[offset:offset + limit]]
+    
+    async def _list_redis_sessions(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        session_ids = await self.redis_client.zrevrange(_SESSIONS_BY_UPDATED, offset, offset + limit - 1)
+        if not session_ids:
+            return []
+        
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                meta_key, state_key, ctx_key, hist_key = _session_keys(session_id.decode())
+                pipe.hgetall(meta_key)
+                pipe.hkeys(state_key)
+                pipe.hkeys(ctx_key)
+                pipe.llen(hist_key)
+            results = await pipe.execute()
+        
+        sessions = []
+        current_time = time.time()
+        for i, session_id in enumerate(session_ids):
+            meta, state_keys, context_keys, history_entries = results[i * 4:i * 4 + 4]
+            if not meta:
+                continue
+            created_at = float(meta[b"created_at"])
+            sessions.append({
+                "session_id": session_id.decode(),
+                "created_at": created_at,
+                "updated_at": float(meta[b"updated_at"]),
+                "state_keys": [key.decode() for key in state_keys],
+                "context_keys": [key.decode() for key in context_keys],
+                "history_entries": history_entries,
+                "duration_seconds": current_time - created_at
+            })
+        return sessions
\ No newline at end of file
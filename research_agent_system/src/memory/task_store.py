@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+import redis.asyncio as redis
+from src.observability.logging import get_logger
+from config.settings import settings
+
+logger = get_logger(__name__)
+
+# Tasks are kept for a day; the sorted set orders them by creation time
+_TASK_TTL = 86400
+_TASK_INDEX = "tasks:by_time"
+# Cap on tasks held in process memory when Redis is unavailable
+_FALLBACK_MAX_TASKS = 1024
+
+class TaskStore:
+    """Task records stored as Redis hashes (task:{id}) indexed by a sorted set"""
+    
+    def __init__(self, redis_url: str = None):
+        self.redis_url = redis_url or settings.redis_url
+        self.redis_client = None
+        self.logger = get_logger(__name__)
+        self.fallback_storage: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+    
+    async def initialize(self):
+        """Probe Redis once; the backend never changes afterwards, so fallback tasks stay reachable"""
+        if self._initialized:
+            return
+        
+        async with self._init_lock:
+            # Callers that queued behind the probe reuse its outcome
+            if self._initialized:
+                return
+            
+            client = redis.from_url(
+                self.redis_url,
+                encoding="utf-8",
+                decode_responses=True
+            )
+            try:
+                await client.ping()
+                self.redis_client = client
+                self.logger.info("TaskStore initialized with Redis")
+            except Exception as e:
+                self.logger.warning(f"Redis connection failed, using fallback storage: {str(e)}")
+                await client.aclose()
+            finally:
+                self._initialized = True
+    
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        # Hash values are flat strings, and request/result are nested dicts
+        return {field: json.dumps(value, default=str) for field, value in fields.items()}
+    
+    @staticmethod
+    def _decode(data: Dict[str, str]) -> Dict[str, Any]:
+        return {field: json.loads(value) for field, value in data.items()}
+    
+    async def create_task(self, task_id: str, record: Dict[str, Any]):
+        await self.initialize()
+        
+        try:
+            if self.redis_client:
+                now = time.time()
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.hset(f"task:{task_id}", mapping=self._encode(record))
+                    pipe.expire(f"task:{task_id}", _TASK_TTL)
+                    pipe.zadd(_TASK_INDEX, {task_id: now})
+                    # Hashes expire on their own; drop their index entries alongside
+                    pipe.zremrangebyscore(_TASK_INDEX, "-inf", now - _TASK_TTL)
+                    await pipe.execute()
+            else:
+                self.fallback_storage[task_id] = dict(record)
+                if len(self.fallback_storage) > _FALLBACK_MAX_TASKS:
+                    self.fallback_storage.popitem(last=False)
+        except Exception as e:
+            self.logger.error(f"Failed to create task: {str(e)}")
+    
+    async def update_task(self, task_id: str, fields: Dict[str, Any]):
+        await self.initialize()
+        
+        try:
+            if self.redis_client:
+                await self.redis_client.hset(f"task:{task_id}", mapping=self._encode(fields))
+            elif task_id in self.fallback_storage:
+                self.fallback_storage[task_id].update(fields)
+        except Exception as e:
+            self.logger.error(f"Failed to update task: {str(e)}")
+    
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        await self.initialize()
+        
+        try:
+            if self.redis_client:
+                data = await self.redis_client.hgetall(f"task:{task_id}")
+                return self._decode(data) if data else None
+            return self.fallback_storage.get(task_id)
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve task: {str(e)}")
+            return None
+    
+    async def list_tasks(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent tasks first"""
+        await self.initialize()
+        
+        try:
+            if self.redis_client:
+                task_ids = await self.redis_client.zrevrange(_TASK_INDEX, 0, limit - 1)
+                if not task_ids:
+                    return []
+                
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for task_id in task_ids:
+                        pipe.hgetall(f"task:{task_id}")
+                    results = await pipe.execute()
+                
+                return [self._decode(data) for data in results if data]
+            
+            tasks = list(self.fallback_storage.values())
+            tasks.reverse()
+            return tasks[:limit]
+        except Exception as e:
+            self.logger.error(f"Failed to list tasks: {str(e)}")
+            return []
+    
+    async def count(self) -> int:
+        await self.initialize()
+        
+        try:
+            if self.redis_client:
+                return await self.redis_client.zcard(_TASK_INDEX)
+            return len(self.fallback_storage)
+        except Exception as e:
+            self.logger.error(f"Failed to count tasks: {str(e)}")
+            return 0
\ No newline at end of file
@@ -1,3 +1,4 @@
+import functools
 import structlog
 import logging
 import sys
@@ -6,10 +7,10 @@ from config.settings import settings
 
 def setup_logging(level: str = None):
     log_level = level or settings.log_level
+    level_number = getattr(logging, log_level.upper())
     
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -19,7 +20,8 @@ def setup_logging(level: str = None):
             structlog.processors.UnicodeDecoder(),
             structlog.processors.JSONRenderer()
         ],
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Calls below the configured level return before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(level_number),
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
@@ -27,9 +29,10 @@ def setup_logging(level: str = None):
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, log_level.upper())
+        level=level_number
     )
 
+@functools.lru_cache(maxsize=4096)
 def get_logger(name: str) -> structlog.BoundLogger:
     return structlog.get_logger(name)
 
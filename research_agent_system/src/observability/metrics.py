@@ -1,10 +1,31 @@
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, REGISTRY
+from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry, generate_latest, REGISTRY
+from prometheus_client import multiprocess
 from typing import Dict, Any
+import glob
+import os
 import time
 from src.observability.logging import get_logger
 
+try:
+    from prometheus_client import CONTENT_TYPE_PLAIN_0_0_4 as CONTENT_TYPE
+except ImportError:  # older clients, where the latest format is still 0.0.4
+    from prometheus_client import CONTENT_TYPE_LATEST as CONTENT_TYPE
+
 logger = get_logger(__name__)
 
+# When set, every worker writes its samples here and /metrics merges them
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    # Metric files are opened as soon as the collectors below are created
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+def prepare_multiprocess_dir():
+    """Drop samples left by a previous run; call before starting the workers"""
+    if not MULTIPROC_DIR:
+        return
+    for path in glob.glob(os.path.join(MULTIPROC_DIR, "*.db")):
+        os.remove(path)
+
 class MetricsCollector:
     def __init__(self):
         # Agent metrics
@@ -29,17 +50,20 @@ class MetricsCollector:
         # System metrics
         self.active_tasks = Gauge(
             'active_tasks_total',
-            'Number of active tasks'
+            'Number of active tasks',
+            multiprocess_mode='livemax'
         )
         
         self.memory_usage = Gauge(
             'memory_entries_total',
-            'Number of memory entries'
+            'Number of memory entries',
+            multiprocess_mode='livemax'
         )
         
         self.sessions_active = Gauge(
             'sessions_active_total',
-            'Number of active sessions'
+            'Number of active sessions',
+            multiprocess_mode='livemax'
         )
         
         # Performance metrics
@@ -75,8 +99,17 @@ class MetricsCollector:
         self.requests_total.labels(endpoint=endpoint, method=method, status_code=status_code).inc()
         self.response_time.labels(endpoint=endpoint, method=method).observe(duration)
     
-    def get_metrics(self) -> str:
-        return generate_latest(REGISTRY).decode('utf-8')
+    def get_metrics(self) -> bytes:
+        if MULTIPROC_DIR:
+            # Aggregate every worker's samples rather than only this process's
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry)
+        return generate_latest(REGISTRY)
+    
+    def mark_process_dead(self):
+        if MULTIPROC_DIR:
+            multiprocess.mark_process_dead(os.getpid())
     
     def get_metrics_summary(self) -> Dict[str, Any]:
         return {
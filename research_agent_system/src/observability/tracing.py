@@ -1,37 +1,77 @@
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.aiohttp_client import AioHttpClientInstrumentor
-import os
+import functools
+from typing import Optional
 from config.settings import settings
+from src.observability.logging import get_logger
 
-# Create resource
-resource = Resource(attributes={
-    "service.name": "research-agent-system",
-    "service.version": "1.0.0",
-    "deployment.environment": "development"
-})
+logger = get_logger(__name__)
 
-# Set up tracer provider
-trace.set_tracer_provider(TracerProvider(resource=resource))
+# Resolves to the real provider once init_tracing() has installed it
+tracer = trace.get_tracer(__name__)
 
-# Configure exporters
-otlp_endpoint = settings.otlp_endpoint
-if otlp_endpoint:
-    trace.get_tracer_provider().add_span_processor(
-        BatchSpanProcessor(OTLPSpanExporter(endpoint=otlp_endpoint))
-    )
-    print(f"Tracing configured with OTLP endpoint: {otlp_endpoint}")
-else:
-    trace.get_tracer_provider().add_span_processor(
-        BatchSpanProcessor(ConsoleSpanExporter())
-    )
-    print("Tracing configured with console exporter")
+# Spans are built only once tracing is initialized and not sampled out entirely
+_sampling_enabled = False
+_provider: Optional[TracerProvider] = None
 
-# Instrument aiohttp client
-AioHttpClientInstrumentor().instrument()
+def init_tracing():
+    """Install the tracer provider and exporters; call from each worker's startup, after uvicorn forks"""
+    global _provider, _sampling_enabled
+    if _provider is not None:
+        return
+    
+    resource = Resource(attributes={
+        "service.name": "research-agent-system",
+        "service.version": "1.0.0",
+        "deployment.environment": "development"
+    })
+    _provider = TracerProvider(resource=resource)
+    
+    otlp_endpoint = settings.otlp_endpoint
+    if otlp_endpoint:
+        # Large batches on a slow timer keep OTLP exports to a few requests per second
+        _provider.add_span_processor(
+            BatchSpanProcessor(
+                OTLPSpanExporter(endpoint=otlp_endpoint),
+                max_queue_size=2048,
+                max_export_batch_size=512,
+                schedule_delay_millis=5000
+            )
+        )
+        logger.info(f"Tracing configured with OTLP endpoint: {otlp_endpoint}")
+    else:
+        _provider.add_span_processor(
+            BatchSpanProcessor(ConsoleSpanExporter())
+        )
+        logger.info("Tracing configured with console exporter")
+    
+    trace.set_tracer_provider(_provider)
+    
+    # Instrument aiohttp client
+    AioHttpClientInstrumentor().instrument()
+    
+    # OTEL_TRACES_SAMPLER=always_off drops every span, so don't build them at all
+    _sampling_enabled = _provider.sampler is not ALWAYS_OFF
 
-# Get tracer
-tracer = trace.get_tracer(__name__)
\ No newline at end of file
+def shutdown_tracing():
+    """Flush spans still queued in the batch processor"""
+    if _provider is not None:
+        _provider.shutdown()
+
+def traced(name: str):
+    """Run an async handler inside a span named `name`, skipping span creation when sampling is off"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if not _sampling_enabled:
+                return await fn(*args, **kwargs)
+            
+            with tracer.start_as_current_span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
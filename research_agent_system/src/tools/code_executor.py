@@ -1,29 +1,32 @@
 import asyncio
-import subprocess
-import tempfile
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from src.observability.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Runs code piped on stdin, so an interpreter can be started before it has anything to run.
+# -c puts the server's cwd first on sys.path; it is dropped so project modules stay out of reach.
+# The code has no __file__, since it never exists as a file.
+_RUNNER = "import sys; del sys.path[0]; exec(compile(sys.stdin.read(), '<code>', 'exec'), {'__name__': '__main__'})"
+
 class CodeExecutorTool:
-    def __init__(self):
+    def __init__(self, pool_size: int = 2):
         self.logger = get_logger(__name__)
+        # Every execution still gets a fresh interpreter; spares are kept warm so callers skip its startup
+        self.pool_size = pool_size
+        self._idle: List[asyncio.subprocess.Process] = []
+        self._refill_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
     async def execute_python_code(self, code: str, timeout: int = 30) -> Dict[str, Any]:
         try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
-            
+            process = await self._take_process()
             result = await asyncio.wait_for(
-                self._run_subprocess(temp_file),
+                self._run_subprocess(process, code),
                 timeout=timeout
             )
             
-            os.unlink(temp_file)
-            
             return {
                 "success": True,
                 "output": result,
@@ -42,27 +45,87 @@ class CodeExecutorTool:
                 "output": "",
                 "error": str(e)
             }
-        finally:
-            if os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
     
-    async def _run_subprocess(self, file_path: str) -> str:
-        process = await asyncio.create_subprocess_exec(
-            'python', file_path,
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            'python', '-c', _RUNNER,
+            stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE
         )
+    
+    async def _take_process(self) -> asyncio.subprocess.Process:
+        loop = asyncio.get_running_loop()
+        # Processes are bound to the loop that started them
+        if self._loop is not loop:
+            self._abandon_pool()
+            self._loop = loop
+        
+        process = None
+        while self._idle and process is None:
+            candidate = self._idle.pop()
+            if candidate.returncode is None:
+                process = candidate
+        if process is None:
+            process = await self._spawn()
         
-        stdout, stderr = await process.communicate()
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = loop.create_task(self._refill())
+        return process
+    
+    async def _refill(self):
+        try:
+            while len(self._idle) < self.pool_size:
+                self._idle.append(await self._spawn())
+        except Exception as e:
+            self.logger.warning(f"Failed to start spare interpreter: {str(e)}")
+    
+    async def _run_subprocess(self, process: asyncio.subprocess.Process, code: str) -> str:
+        try:
+            stdout, stderr = await process.communicate(code.encode())
+        except asyncio.CancelledError:
+            # Timed out; don't leave the code running
+            if process.returncode is None:
+                process.kill()
+            raise
         
         if process.returncode == 0:
             return stdout.decode()
         else:
             return stderr.decode()
     
+    def _abandon_pool(self):
+        """Stop the spares started on a previous loop; that loop can't be awaited from here"""
+        if self._refill_task and not self._refill_task.done():
+            try:
+                self._refill_task.cancel()
+            except RuntimeError:
+                pass  # its loop is already closed, so the task can never run again
+        for process in self._idle:
+            if process.returncode is None:
+                try:
+                    process.kill()
+                    # Reap it here, since the loop that would have may never run again
+                    os.waitpid(process.pid, 0)
+                except (ProcessLookupError, ChildProcessError):
+                    pass
+        self._idle = []
+        self._refill_task = None
+    
+    async def close(self):
+        if self._loop is not asyncio.get_running_loop():
+            self._abandon_pool()
+            return
+        
+        if self._refill_task and not self._refill_task.done():
+            self._refill_task.cancel()
+        for process in self._idle:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        self._idle = []
+        self._refill_task = None
+    
     async def validate_syntax(self, code: str, language: str = "python") -> Dict[str, Any]:
         if language == "python":
             try:
@@ -1,26 +1,53 @@
-import aiofiles
 import asyncio
 import os
 import json
 from typing import Dict, Any, List
 from src.observability.logging import get_logger
 
+try:
+    # Kernel async I/O through libaio on Linux, instead of a thread hop per read/write
+    from aiofile import async_open
+except ImportError:  # optional: fall back to aiofiles' thread pool
+    import aiofiles
+    async_open = aiofiles.open
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json writes the same documents, just slower
+    orjson = None
+
 logger = get_logger(__name__)
 
+def _dump_json(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+def _load_json(raw: bytes) -> Any:
+    # Both parsers take UTF-8 bytes directly, so nothing is decoded up front
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
 class FileOperationsTool:
     def __init__(self, base_path: str = "./data"):
         self.base_path = base_path
         os.makedirs(base_path, exist_ok=True)
+        # Directories already created by this tool, so hot paths skip the mkdir syscall
+        self._ensured_dirs = {os.path.join(base_path, "")}
         self.logger = get_logger(__name__)
+    
+    def _ensure_directory(self, directory: str):
+        if directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
         
     async def save_content(self, filename: str, content: str, subdirectory: str = "") -> Dict[str, Any]:
         try:
             directory = os.path.join(self.base_path, subdirectory)
-            os.makedirs(directory, exist_ok=True)
+            self._ensure_directory(directory)
             
             filepath = os.path.join(directory, filename)
             
-            async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
+            async with async_open(filepath, 'w', encoding='utf-8') as f:
                 await f.write(content)
             
             self.logger.info(f"Content saved to {filepath}")
@@ -31,6 +58,8 @@ class FileOperationsTool:
             }
             
         except Exception as e:
+            # A cached directory may have been removed underneath us; check them all again
+            self._ensured_dirs.clear()
             self.logger.error(f"Failed to save content: {str(e)}")
             return {
                 "success": False,
@@ -41,7 +70,7 @@ class FileOperationsTool:
         try:
             filepath = os.path.join(self.base_path, subdirectory, filename)
             
-            async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
+            async with async_open(filepath, 'r', encoding='utf-8') as f:
                 content = await f.read()
             
             return {
@@ -60,21 +89,24 @@ class FileOperationsTool:
     async def save_json(self, filename: str, data: Dict[str, Any], subdirectory: str = "") -> Dict[str, Any]:
         try:
             directory = os.path.join(self.base_path, subdirectory)
-            os.makedirs(directory, exist_ok=True)
+            self._ensure_directory(directory)
             
             filepath = os.path.join(directory, filename)
+            payload = _dump_json(data)
             
-            async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, indent=2))
+            async with async_open(filepath, 'wb') as f:
+                await f.write(payload)
             
             self.logger.info(f"JSON data saved to {filepath}")
             return {
                 "success": True,
                 "filepath": filepath,
-                "size": len(json.dumps(data))
+                "size": len(payload)
             }
             
         except Exception as e:
+            # A cached directory may have been removed underneath us; check them all again
+            self._ensured_dirs.clear()
             self.logger.error(f"Failed to save JSON: {str(e)}")
             return {
                 "success": False,
@@ -85,9 +117,8 @@ class FileOperationsTool:
         try:
             filepath = os.path.join(self.base_path, subdirectory, filename)
             
-            async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                data = json.loads(content)
+            async with async_open(filepath, 'rb') as f:
+                data = _load_json(await f.read())
             
             return {
                 "success": True,
@@ -104,16 +135,12 @@ class FileOperationsTool:
     async def list_files(self, subdirectory: str = "") -> List[str]:
         try:
             directory = os.path.join(self.base_path, subdirectory)
-            if not os.path.exists(directory):
-                return []
-            
-            files = []
-            for filename in os.listdir(directory):
-                if os.path.isfile(os.path.join(directory, filename)):
-                    files.append(filename)
-            
-            return files
+            # DirEntry.is_file() uses the type readdir already returned, so no stat per entry
+            with os.scandir(directory) as entries:
+                return [entry.name for entry in entries if entry.is_file()]
             
+        except FileNotFoundError:
+            return []
         except Exception as e:
             self.logger.error(f"Failed to list files: {str(e)}")
             return []
\ No newline at end of file
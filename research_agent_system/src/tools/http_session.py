@@ -0,0 +1,41 @@
+import asyncio
+import aiohttp
+from typing import Optional
+from src.observability.logging import get_logger
+
+logger = get_logger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _create_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        # Resolved hosts are reused for five minutes across all pooled connections
+        connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=30, ttl_dns_cache=300),
+        timeout=aiohttp.ClientTimeout(total=30)
+    )
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide session so every caller shares one connection pool"""
+    global _session, _session_loop
+    
+    loop = asyncio.get_running_loop()
+    # A session is bound to the loop it was created on
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session and not _session.closed:
+            # Its loop is gone, so it can no longer be closed cleanly
+            _session.detach()
+        _session = _create_session()
+        _session_loop = loop
+        logger.debug("Created shared HTTP session")
+    
+    return _session
+
+async def close_session():
+    global _session, _session_loop
+    
+    if _session and not _session.closed and _session_loop is asyncio.get_running_loop():
+        await _session.close()
+    
+    _session = None
+    _session_loop = None
@@ -1,23 +1,41 @@
-import aiohttp
 import asyncio
+import functools
 from typing import List, Dict, Any
 import json
 from src.observability.logging import get_logger
+from src.tools.http_session import get_session
+from config.settings import settings
 
 logger = get_logger(__name__)
 
+_SNIPPET_TEMPLATE = 'This is a simulated search result for "{query}". In a production environment, this would be real data from search APIs.'
+
+@functools.lru_cache(maxsize=1024)
+def _simulated_results(query: str, max_results: int) -> tuple:
+    # The snippet only depends on the query, so it is formatted once and shared by every result
+    snippet = _SNIPPET_TEMPLATE.format(query=query)
+    return tuple(
+        {
+            'title': f'Research Result {i} for: {query}',
+            'snippet': snippet,
+            'url': f'https://example.com/research-{i}',
+            'display_url': 'research.example.com'
+        }
+        for i in range(1, max_results + 1)
+    )
+
 class WebSearchTool:
     def __init__(self):
         self.base_url = "https://www.googleapis.com/customsearch/v1"
         self.session = None
         
     async def search_async(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        self.session = await get_session()
             
         try:
             # Simulated search for demo purposes
-            await asyncio.sleep(0.5)  # Simulate API call
+            if settings.simulate_latency:
+                await asyncio.sleep(0.5)  # Simulate API call
             
             return self._get_simulated_results(query, max_results)
                     
@@ -25,16 +43,18 @@ class WebSearchTool:
             logger.error(f"Search failed: {str(e)}")
             return self._get_fallback_results(query)
     
+    async def search_many(self, queries: List[str], max_results: int = 5) -> List[List[Dict[str, Any]]]:
+        """Run several searches concurrently over the shared session, one result list per query"""
+        # Repeated queries are searched once
+        unique_queries = list(dict.fromkeys(queries))
+        results = await asyncio.gather(*(self.search_async(query, max_results) for query in unique_queries))
+        by_query = dict(zip(unique_queries, results))
+        # Every position gets its own copies, so changing one result can't change a repeat
+        return [[dict(result) for result in by_query[query]] for query in queries]
+    
     def _get_simulated_results(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        results = []
-        for i in range(max_results):
-            results.append({
-                'title': f'Research Result {i+1} for: {query}',
-                'snippet': f'This is a simulated search result for "{query}". In a production environment, this would be real data from search APIs.',
-                'url': f'https://example.com/research-{i+1}',
-                'display_url': 'research.example.com'
-            })
-        return results
+        # Copies, so callers can't alter the cached entries
+        return [dict(result) for result in _simulated_results(query, max_results)]
     
     def _get_fallback_results(self, query: str) -> List[Dict[str, Any]]:
         return [{
@@ -44,6 +64,13 @@ class WebSearchTool:
             'display_url': 'example.com'
         }]
     
+    async def __aenter__(self) -> "WebSearchTool":
+        self.session = await get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
     async def close(self):
-        if self.session:
-            await self.session.close()
\ No newline at end of file
+        # The shared session outlives individual tools; it is closed on app shutdown
+        self.session = None
\ No newline at end of file
@@ -0,0 +1 @@
+"""Background worker modules package"""
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+ARQ worker that runs research tasks queued by the API.
+
+Start it next to the API with:
+    arq src.workers.research_worker.WorkerSettings
+"""
+
+from typing import Dict, Any
+from arq.connections import RedisSettings
+from src.api import routes
+from src.observability.logging import get_logger
+from config.settings import settings
+
+logger = get_logger(__name__)
+
+async def execute_research_task(ctx: Dict[str, Any], task_id: str, task_data: Dict[str, Any]):
+    await routes.execute_research_task(task_id, task_data)
+
+async def startup(ctx: Dict[str, Any]):
+    await routes.startup_event()
+    logger.info("Research worker ready")
+
+async def shutdown(ctx: Dict[str, Any]):
+    await routes.shutdown_event()
+
+class WorkerSettings:
+    functions = [execute_research_task]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(settings.redis_url)
+    max_jobs = settings.max_concurrent_tasks
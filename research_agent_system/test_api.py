@@ -6,59 +6,77 @@ Test all endpoints of the Research Agent System
 
 import requests
 import json
-import time
+import threading
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:8000"
 
+# requests.Session isn't thread-safe, so each thread keeps its own keep-alive connection
+_thread_state = threading.local()
+
+def get_session():
+    """This thread's session, created on first use"""
+    if not hasattr(_thread_state, "session"):
+        _thread_state.session = requests.Session()
+    return _thread_state.session
+
+def success(message):
+    return f" {message}"
+
+def error(message):
+    return f" {message}"
+
 def print_success(message):
     """Print success message"""
-    print(f" {message}")
+    print(success(message))
 
 def print_error(message):
     """Print error message"""
-    print(f" {message}")
+    print(error(message))
 
 def print_info(message):
     """Print info message"""
     print(f"  {message}")
 
 def test_health():
-    """Test health endpoint"""
+    """Test health endpoint; returns whether it passed and its output lines"""
+    lines = []
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = get_session().get(f"{BASE_URL}/health")
         if response.status_code == 200:
             data = response.json()
-            print_success(f"Health Check: {data['status']}")
-            print(f"   Version: {data['version']}")
-            print(f"   Components: {', '.join(data['components'].keys())}")
-            return True
+            lines.append(success(f"Health Check: {data['status']}"))
+            lines.append(f"   Version: {data['version']}")
+            lines.append(f"   Components: {', '.join(data['components'].keys())}")
+            return True, lines
         else:
-            print_error(f"Health check failed with status {response.status_code}")
-            return False
+            lines.append(error(f"Health check failed with status {response.status_code}"))
+            return False, lines
     except Exception as e:
-        print_error(f"Health check failed: {e}")
-        return False
+        lines.append(error(f"Health check failed: {e}"))
+        return False, lines
 
 def test_status():
-    """Test status endpoint"""
+    """Test status endpoint; returns whether it passed and its output lines"""
+    lines = []
     try:
-        response = requests.get(f"{BASE_URL}/status")
+        response = get_session().get(f"{BASE_URL}/status")
         if response.status_code == 200:
             data = response.json()
-            print_success("System Status:")
-            print(f"   Status: {data['status']}")
-            print(f"   Active Tasks: {data['active_tasks']}")
-            print(f"   Agents Online: {', '.join(data['agents_online'])}")
-            print(f"   Memory Entries: {data['memory_entries']}")
-            print(f"   Active Sessions: {data['active_sessions']}")
-            return True
+            lines.append(success("System Status:"))
+            lines.append(f"   Status: {data['status']}")
+            lines.append(f"   Active Tasks: {data['active_tasks']}")
+            lines.append(f"   Agents Online: {', '.join(data['agents_online'])}")
+            lines.append(f"   Memory Entries: {data['memory_entries']}")
+            lines.append(f"   Active Sessions: {data['active_sessions']}")
+            return True, lines
         else:
-            print_error(f"Status check failed with status {response.status_code}")
-            return False
+            lines.append(error(f"Status check failed with status {response.status_code}"))
+            return False, lines
     except Exception as e:
-        print_error(f"Status check failed: {e}")
-        return False
+        lines.append(error(f"Status check failed: {e}"))
+        return False, lines
 
 def test_create_research_task():
     """Test creating a research task"""
@@ -71,7 +89,7 @@ def test_create_research_task():
             "depth": "detailed"
         }
         
-        response = requests.post(f"{BASE_URL}/research", json=research_data)
+        response = get_session().post(f"{BASE_URL}/research", json=research_data)
         if response.status_code == 200:
             data = response.json()
             print_success(f"Research Task Created: {data['task_id']}")
@@ -88,7 +106,7 @@ def test_create_research_task():
 def test_get_task_status(task_id):
     """Test getting task status"""
     try:
-        response = requests.get(f"{BASE_URL}/tasks/{task_id}")
+        response = get_session().get(f"{BASE_URL}/tasks/{task_id}")
         if response.status_code == 200:
             data = response.json()
             print_success(f"Task Status for {task_id}:")
@@ -113,74 +131,81 @@ def test_get_task_status(task_id):
         return False
 
 def test_list_tasks():
-    """Test listing all tasks"""
+    """Test listing all tasks; returns whether it passed and its output lines"""
+    lines = []
     try:
-        response = requests.get(f"{BASE_URL}/tasks")
+        response = get_session().get(f"{BASE_URL}/tasks")
         if response.status_code == 200:
             data = response.json()
-            print_success(f"Task List: {data['total_tasks']} total tasks")
+            lines.append(success(f"Task List: {data['total_tasks']} total tasks"))
             
             for task in data['tasks'][:3]:  
-                print(f"   - {task['task_id']}: {task['topic']} ({task['status']})")
+                lines.append(f"   - {task['task_id']}: {task['topic']} ({task['status']})")
             
-            return True
+            return True, lines
         else:
-            print_error(f"Task list failed with status {response.status_code}")
-            return False
+            lines.append(error(f"Task list failed with status {response.status_code}"))
+            return False, lines
     except Exception as e:
-        print_error(f"Task list failed: {e}")
-        return False
+        lines.append(error(f"Task list failed: {e}"))
+        return False, lines
 
 def test_metrics():
-    """Test metrics endpoint"""
+    """Test metrics endpoint; returns whether it passed and its output lines"""
+    lines = []
     try:
-        response = requests.get(f"{BASE_URL}/metrics")
+        response = get_session().get(f"{BASE_URL}/metrics")
         if response.status_code == 200:
-            print_success("Metrics endpoint working")
+            lines.append(success("Metrics endpoint working"))
             # Metrics are in Prometheus format, just check if we get content
             if len(response.text) > 0:
-                print("   Metrics data received successfully")
-            return True
+                lines.append("   Metrics data received successfully")
+            return True, lines
         else:
-            print_error(f"Metrics endpoint failed with status {response.status_code}")
-            return False
+            lines.append(error(f"Metrics endpoint failed with status {response.status_code}"))
+            return False, lines
     except Exception as e:
-        print_error(f"Metrics endpoint failed: {e}")
-        return False
+        lines.append(error(f"Metrics endpoint failed: {e}"))
+        return False, lines
 
 def test_memory_stats():
-    """Test memory statistics"""
+    """Test memory statistics; returns whether it passed and its output lines"""
+    lines = []
     try:
-        response = requests.get(f"{BASE_URL}/memory/stats")
+        response = get_session().get(f"{BASE_URL}/memory/stats")
         if response.status_code == 200:
             data = response.json()
-            print_success("Memory Statistics:")
-            print(f"   Total Memories: {data.get('total_memories', 0)}")
-            print(f"   Storage Backend: {data.get('storage_backend', 'unknown')}")
-            print(f"   Status: {data.get('status', 'unknown')}")
-            return True
+            lines.append(success("Memory Statistics:"))
+            lines.append(f"   Total Memories: {data.get('total_memories', 0)}")
+            lines.append(f"   Storage Backend: {data.get('storage_backend', 'unknown')}")
+            lines.append(f"   Status: {data.get('status', 'unknown')}")
+            return True, lines
         else:
-            print_error(f"Memory stats failed with status {response.status_code}")
-            return False
+            lines.append(error(f"Memory stats failed with status {response.status_code}"))
+            return False, lines
     except Exception as e:
-        print_error(f"Memory stats failed: {e}")
-        return False
+        lines.append(error(f"Memory stats failed: {e}"))
+        return False, lines
 
 def test_session_stats():
-    """Test session statistics"""
+    """Test session statistics; returns whether it passed and its output lines"""
+    lines = []
     try:
-        response = requests.get(f"{BASE_URL}/sessions/stats")
+        response = get_session().get(f"{BASE_URL}/sessions/stats")
         if response.status_code == 200:
             data = response.json()
-            print_success("Session Statistics:")
-            print(f"   Total Sessions: {data.get('total_sessions', 0)}")
-            return True
+            lines.append(success("Session Statistics:"))
+            lines.append(f"   Total Sessions: {data.get('total_sessions', 0)}")
+            return True, lines
         else:
-            print_error(f"Session stats failed with status {response.status_code}")
-            return False
+            lines.append(error(f"Session stats failed with status {response.status_code}"))
+            return False, lines
     except Exception as e:
-        print_error(f"Session stats failed: {e}")
-        return False
+        lines.append(error(f"Session stats failed: {e}"))
+        return False, lines
+
+# Checks with no dependency on each other, run concurrently
+INDEPENDENT_CHECKS = [test_health, test_status, test_list_tasks, test_metrics, test_memory_stats, test_session_stats]
 
 def main():
     """Main test function"""
@@ -195,66 +220,38 @@ def main():
     tests_passed = 0
     tests_failed = 0
     
-    # Test 1: Health check
-    if test_health():
-        tests_passed += 1
-    else:
-        tests_failed += 1
-    print()
-    
-    # Test 2: Status check
-    if test_status():
-        tests_passed += 1
-    else:
-        tests_failed += 1
-    print()
-    
-    # Test 3: Create research task
-    task_id = test_create_research_task()
-    if task_id:
-        tests_passed += 1
+    with ThreadPoolExecutor(max_workers=len(INDEPENDENT_CHECKS)) as executor:
+        futures = [executor.submit(check) for check in INDEPENDENT_CHECKS]
         
-        # Wait a bit for task processing
-        print_info("Waiting for task processing...")
-        time.sleep(2)
-        
-        # Test 4: Get task status
-        if test_get_task_status(task_id):
+        # The task round trip needs its own results in order, so it runs here meanwhile
+        task_id = test_create_research_task()
+        if task_id:
             tests_passed += 1
+            
+            # Long-poll: the server answers as soon as the task finishes (or after the timeout)
+            print_info("Waiting for task processing...")
+            try:
+                get_session().get(f"{BASE_URL}/tasks/{task_id}/wait", params={"timeout": 30})
+            except Exception as e:
+                print_error(f"Waiting for task failed: {e}")
+            
+            if test_get_task_status(task_id):
+                tests_passed += 1
+            else:
+                tests_failed += 1
         else:
             tests_failed += 1
-    else:
-        tests_failed += 1
-    print()
-    
-    # Test 5: List tasks
-    if test_list_tasks():
-        tests_passed += 1
-    else:
-        tests_failed += 1
-    print()
-    
-    # Test 6: Metrics
-    if test_metrics():
-        tests_passed += 1
-    else:
-        tests_failed += 1
-    print()
-    
-    # Test 7: Memory stats
-    if test_memory_stats():
-        tests_passed += 1
-    else:
-        tests_failed += 1
-    print()
-    
-    # Test 8: Session stats
-    if test_session_stats():
-        tests_passed += 1
-    else:
-        tests_failed += 1
+        print()
+        
+        for future in futures:
+            passed, lines = future.result()
+            print("\n".join(lines))
+            print()
+            if passed:
+                tests_passed += 1
+            else:
+                tests_failed += 1
     
-    print()
     print("=" * 50)
     print(f"Test Results: {tests_passed} passed, {tests_failed} failed")
     
@@ -1,4 +1,5 @@
 import google.generativeai as genai
+from google.api_core.exceptions import NotFound
 import os
 from dotenv import load_dotenv
 
@@ -14,24 +15,31 @@ try:
     genai.configure(api_key=api_key)
     print(" Gemini configured successfully!")
     
-    # List all available models
-    print("\n Available models with generateContent:")
-    available_models = []
-    for model in genai.list_models():
-        if 'generateContent' in model.supported_generation_methods:
-            available_models.append(model.name)
-            print(f" {model.name}")
-    
-    if not available_models:
-        print(" No models found with generateContent capability!")
-        exit(1)
-    
-    # Test the first available model
-    test_model = available_models[0]
+    # Try the configured model first; listing models is an extra round trip
+    test_model = os.getenv('GEMINI_MODEL', 'gemini-pro-latest')
     print(f"\n Testing with model: {test_model}")
     
-    model = genai.GenerativeModel(test_model)
-    response = model.generate_content("Write one sentence about AI.")
+    try:
+        model = genai.GenerativeModel(test_model)
+        response = model.generate_content("Write one sentence about AI.")
+    except NotFound:
+        print(f" Model {test_model} not found, looking for one with generateContent:")
+        available_models = []
+        for listed_model in genai.list_models():
+            if 'generateContent' in listed_model.supported_generation_methods:
+                available_models.append(listed_model.name)
+                print(f" {listed_model.name}")
+        
+        if not available_models:
+            print(" No models found with generateContent capability!")
+            exit(1)
+        
+        # Test the first available model
+        test_model = available_models[0]
+        print(f"\n Testing with model: {test_model}")
+        
+        model = genai.GenerativeModel(test_model)
+        response = model.generate_content("Write one sentence about AI.")
     
     print(" API Test SUCCESSFUL!")
     print(f" Response: {response.text}")
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+import httpx
+import pytest_asyncio
+from src.api.routes import app
+from src.main import event_loop_factory
+from src.agents.research_agent import ResearchAgent
+from src.agents.writing_agent import WritingAgent
+from src.agents.analysis_agent import AnalysisAgent
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.tools.web_search import WebSearchTool
+from src.tools.code_executor import CodeExecutorTool
+
+def pytest_asyncio_loop_factories(config, item):
+    """The server's loop (uvloop when installed) for every async test"""
+    return {"server_loop": event_loop_factory()}
+
+# Started once and shared by every test that only uses agents, not their lifecycle
+
+@pytest_asyncio.fixture(scope="session")
+async def agents():
+    """The three worker agents plus a coordinator over them, keyed by role"""
+    research_agent = ResearchAgent()
+    writing_agent = WritingAgent()
+    analysis_agent = AnalysisAgent()
+    coordinator = CoordinatorAgent(research_agent, writing_agent, analysis_agent)
+    
+    # The worker agents start independently; the coordinator drives them, so it goes last
+    await asyncio.gather(research_agent.start(), writing_agent.start(), analysis_agent.start())
+    await coordinator.start()
+    yield {
+        "research": research_agent,
+        "writing": writing_agent,
+        "analysis": analysis_agent,
+        "coordinator": coordinator
+    }
+    await asyncio.gather(
+        *(agent.stop() for agent in (research_agent, writing_agent, analysis_agent, coordinator)),
+        return_exceptions=True
+    )
+
+@pytest.fixture(scope="session")
+def research_agent(agents):
+    return agents["research"]
+
+@pytest.fixture(scope="session")
+def writing_agent(agents):
+    return agents["writing"]
+
+@pytest.fixture(scope="session")
+def analysis_agent(agents):
+    return agents["analysis"]
+
+@pytest.fixture(scope="session")
+def coordinator(agents):
+    return agents["coordinator"]
+
+@pytest_asyncio.fixture(scope="session")
+async def web_search_tool():
+    async with WebSearchTool() as tool:
+        yield tool
+
+@pytest_asyncio.fixture(scope="session")
+async def code_executor():
+    executor = CodeExecutorTool()
+    yield executor
+    await executor.close()
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """One app instance for the whole run; startup and shutdown events fire once"""
+    # ASGITransport skips lifespan events, so they are driven here
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+            # Starlette builds the middleware stack on the first request; pay for it here, not in a test
+            await test_client.get("/health")
+            yield test_client
@@ -1,11 +1,14 @@
 import pytest
 import asyncio
+import time
+import threading
+from collections import deque
 from src.agents.research_agent import ResearchAgent
 from src.agents.writing_agent import WritingAgent
 from src.agents.analysis_agent import AnalysisAgent
 from src.models.schemas import AgentType, AgentMessage
+from src.memory.memory_bank import MemoryBank
 
-@pytest.mark.asyncio
 async def test_research_agent_initialization():
     """Test research agent initialization"""
     agent = ResearchAgent()
@@ -18,12 +21,8 @@ async def test_research_agent_initialization():
     await agent.stop()
     assert agent.is_running == False
 
-@pytest.mark.asyncio
-async def test_research_agent_process_message():
+async def test_research_agent_process_message(research_agent):
     """Test research agent message processing"""
-    agent = ResearchAgent()
-    await agent.start()
-    
     message = AgentMessage(
         sender=AgentType.COORDINATOR,
         receiver=AgentType.RESEARCH,
@@ -31,42 +30,30 @@ async def test_research_agent_process_message():
         message_type="research_request"
     )
     
-    result = await agent.process_message(message)
+    result = await research_agent.process_message(message)
     assert result["status"] in ["completed", "failed"]
     assert "result" in result or "error" in result
-    
-    await agent.stop()
 
-@pytest.mark.asyncio
-async def test_writing_agent_content_generation():
+async def test_writing_agent_content_generation(writing_agent):
     """Test writing agent content generation"""
-    agent = WritingAgent()
-    await agent.start()
-    
     test_content = {
         "research_content": "This is test research content about AI technology.",
         "content_type": "article",
         "tone": "professional"
     }
     
-    result = await agent.generate_content(test_content)
+    result = await writing_agent.generate_content(test_content)
     assert result["status"] in ["completed", "failed"]
     assert "content" in result or "error" in result
-    
-    await agent.stop()
 
-@pytest.mark.asyncio
-async def test_analysis_agent_content_analysis():
+async def test_analysis_agent_content_analysis(analysis_agent):
     """Test analysis agent content analysis"""
-    agent = AnalysisAgent()
-    await agent.start()
-    
     test_content = {
         "content": "This is a test content for analysis. It contains multiple sentences to analyze for quality and sentiment.",
         "analysis_type": "quality"
     }
     
-    result = await agent.analyze_content(test_content)
+    result = await analysis_agent.analyze_content(test_content)
     assert result["status"] in ["completed", "failed"]
     assert "analysis_report" in result or "error" in result
     
@@ -75,18 +62,9 @@ async def test_analysis_agent_content_analysis():
         assert "sentiment" in report
         assert "readability_score" in report
         assert "content_length" in report
-    
-    await agent.stop()
 
-@pytest.mark.asyncio
-async def test_agent_message_passing():
+async def test_agent_message_passing(research_agent, writing_agent):
     """Test agent-to-agent message passing"""
-    research_agent = ResearchAgent()
-    writing_agent = WritingAgent()
-    
-    await research_agent.start()
-    await writing_agent.start()
-    
     # Test message creation
     message = await research_agent.send_message(
         AgentType.WRITING,
@@ -97,26 +75,240 @@ async def test_agent_message_passing():
     assert message.sender == AgentType.RESEARCH
     assert message.receiver == AgentType.WRITING
     assert message.message_type == "data_transfer"
-    
-    await research_agent.stop()
-    await writing_agent.stop()
 
-@pytest.mark.asyncio
-async def test_agent_memory_storage():
+async def test_agent_memory_storage(research_agent):
     """Test agent memory storage functionality"""
-    agent = ResearchAgent()
-    await agent.start()
-    
     test_data = {"key": "value", "number": 42}
     test_key = "test_memory"
     
     # Store memory
-    await agent.memory_bank.store_memory(test_key, test_data)
+    await research_agent.memory_bank.store_memory(test_key, test_data)
     
     # Retrieve memory
-    retrieved = await agent.memory_bank.retrieve_memory(test_key)
+    retrieved = await research_agent.memory_bank.retrieve_memory(test_key)
     assert retrieved is not None
     assert retrieved["data"]["key"] == "value"
     assert retrieved["data"]["number"] == 42
+
+async def test_clear_old_memories_fallback():
+    """Test expired fallback memories are swept by wall-clock age"""
+    memory_bank = MemoryBank()
+    await memory_bank.store_memory("fresh", {"n": 1})
+    await memory_bank.store_memory("stale", {"n": 2})
+    memory_bank.fallback_storage["memory:stale"]["timestamp"] = time.time() - 7200
+    
+    await memory_bank.clear_old_memories(older_than_seconds=3600)
+    
+    assert await memory_bank.retrieve_memory("fresh") is not None
+    assert await memory_bank.retrieve_memory("stale") is None
+
+async def test_memory_bank_callers_wait_for_the_probe(monkeypatch):
+    """Test a caller arriving mid-probe sees its outcome instead of the fallback"""
+    from src.memory import memory_bank as memory_bank_module
+    
+    class _SlowRedis:
+        def __init__(self, connection_pool):
+            pass
+        
+        async def ping(self):
+            await asyncio.sleep(0.01)
+            return True
+    
+    monkeypatch.setattr(memory_bank_module.redis, "Redis", _SlowRedis)
+    memory_bank = MemoryBank()
+    
+    async def initialized_client():
+        await memory_bank.initialize()
+        return memory_bank.redis_client
+    
+    clients = await asyncio.gather(initialized_client(), initialized_client())
+    assert all(isinstance(client, _SlowRedis) for client in clients)
+
+class _StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+class _StubModel:
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        call_number = self.calls
+        time.sleep(0.01)
+        if stream:
+            return [_StubResponse("response "), _StubResponse(str(call_number))]
+        return _StubResponse(f"response {call_number}")
+
+async def test_agent_llm_cache():
+    """Test identical prompts are served from the LLM cache"""
+    agent = ResearchAgent()
+    agent.model = _StubModel()
+    
+    first = await agent._call_llm("Summarize AI research")
+    second = await agent._call_llm("Summarize AI research")
+    other = await agent._call_llm("Summarize ML research")
+    
+    assert first == second == "response 1"
+    assert other == "response 2"
+    assert agent.model.calls == 2
+
+async def test_agent_llm_inflight_deduplication():
+    """Test concurrent identical prompts share one LLM request"""
+    agent = WritingAgent()
+    agent.model = _StubModel()
+    
+    results = await asyncio.gather(*(agent._call_llm("Draft an article") for _ in range(5)))
+    
+    assert results == ["response 1"] * 5
+    assert agent.model.calls == 1
+    assert agent._inflight == {}
+
+async def test_agent_llm_cancelled_caller_leaves_others_waiting():
+    """Test cancelling the first caller doesn't cancel callers sharing its request"""
+    agent = WritingAgent()
+    agent.model = _StubModel()
+    
+    first = asyncio.create_task(agent._call_llm("Draft a report"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(agent._call_llm("Draft a report"))
+    await asyncio.sleep(0)
+    first.cancel()
+    
+    assert await second == "response 1"
+    assert first.cancelled()
+    assert agent.model.calls == 1
+    assert agent._inflight == {}
+
+async def test_agent_llm_streaming():
+    """Test streamed LLM chunks arrive in order and fill the cache"""
+    agent = AnalysisAgent()
+    agent.model = _StubModel()
+    
+    chunks = [chunk async for chunk in agent._stream_llm("Analyze this")]
+    
+    assert chunks == ["response ", "1"]
+    assert await agent._call_llm("Analyze this") == "response 1"
+    assert agent.model.calls == 1
+
+class _EndlessStubModel:
+    def __init__(self):
+        self.produced = 0
+        self.finished = threading.Event()
+    
+    def generate_content(self, prompt, stream=False):
+        try:
+            for _ in range(1000):
+                self.produced += 1
+                time.sleep(0.001)
+                yield _StubResponse("chunk ")
+        finally:
+            self.finished.set()
+
+async def test_stream_stops_producer_when_consumer_leaves():
+    """Test the worker stops draining the stream once the consumer closes it"""
+    from src.llm import gemini_client
+    
+    model = _EndlessStubModel()
+    chunks = gemini_client.stream("Endless", model)
+    assert await chunks.__anext__() == "chunk "
+    await chunks.aclose()
+    
+    assert await asyncio.to_thread(model.finished.wait, 5)
+    assert model.produced < 1000
+
+class _FailingStreamModel:
+    def generate_content(self, prompt, stream=False):
+        yield _StubResponse("partial ")
+        raise RuntimeError("stream dropped")
+
+async def test_stream_research_aborts_on_mid_stream_failure():
+    """Test a failure after the first chunk aborts the stream instead of ending it quietly"""
+    agent = ResearchAgent()
+    agent.model = _FailingStreamModel()
+    
+    chunks = []
+    with pytest.raises(RuntimeError):
+        async for chunk in agent.stream_research({"topic": "Interrupted Topic"}):
+            chunks.append(chunk)
+    assert chunks == ["partial "]
+
+class _FakePipeline:
+    def __init__(self, store, executed):
+        self.store = store
+        self.executed = executed
+        self.commands = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    def setex(self, key, ttl, value):
+        self.commands.append((key, value))
+    
+    def zadd(self, name, mapping):
+        pass
+    
+    def zremrangebyscore(self, name, min_score, max_score):
+        pass
+    
+    async def execute(self):
+        self.executed.append(len(self.commands))
+        self.store.update(self.commands)
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.executed = []
+    
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.store, self.executed)
+    
+    async def get(self, key):
+        return self.store.get(key)
+    
+    async def setex(self, key, ttl, value):
+        # Like Redis without decode_responses, values come back as bytes
+        self.store[key] = value.encode() if isinstance(value, str) else value
+
+async def test_memory_bank_batches_redis_writes():
+    """Test queued memory writes reach Redis in one pipelined batch"""
+    memory_bank = MemoryBank()
+    memory_bank.redis_client = _FakeRedis()
+    
+    for i in range(10):
+        await memory_bank.store_memory(f"batch_{i}", {"index": i})
+    
+    retrieved = await memory_bank.retrieve_memory("batch_7")
+    assert retrieved["data"]["index"] == 7
+    assert memory_bank.redis_client.executed == [10]
+    
+    await memory_bank.close()
+
+async def test_agent_llm_shared_cache():
+    """Test LLM responses are shared between agents through Redis"""
+    shared_redis = _FakeRedis()
+    first_agent = ResearchAgent()
+    second_agent = ResearchAgent()
+    for agent in (first_agent, second_agent):
+        agent.model = _StubModel()
+        agent.memory_bank.redis_client = shared_redis
+    
+    assert await first_agent._call_llm("Shared prompt") == "response 1"
+    assert await second_agent._call_llm("Shared prompt") == "response 1"
+    assert first_agent.model.calls == 1
+    assert second_agent.model.calls == 0
+
+async def test_session_history_is_bounded():
+    """Test session history keeps only the most recent entries"""
+    from src.memory.session_manager import Session
+    
+    session = Session("bounded_history")
+    session.history = deque(maxlen=3)
+    for i in range(5):
+        await session.add_to_history("step", i)
     
-    await agent.stop()
\ No newline at end of file
+    assert [entry["data"] for entry in await session.get_full_history()] == [2, 3, 4]
+    assert [entry["data"] for entry in await session.get_recent_history(2)] == [3, 4]
\ No newline at end of file